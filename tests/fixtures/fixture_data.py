@@ -2,7 +2,7 @@ import tempfile
 
 import pytest
 from mixer.backend.django import mixer as _mixer
-from posts.models import Post, Group
+from posts.tests import factories
 
 
 @pytest.fixture()
@@ -20,28 +20,30 @@ def mixer():
 @pytest.fixture
 def post(user):
     image = tempfile.NamedTemporaryFile(suffix=".jpg").name
-    return Post.objects.create(text='Тестовый пост 1', author=user, image=image)
+    return factories.create_post(user, text='Тестовый пост 1', image=image)
 
 
 @pytest.fixture
 def group():
-    return Group.objects.create(title='Тестовая группа 1', slug='test-link', description='Тестовое описание группы')
+    return factories.create_group(
+        title='Тестовая группа 1', slug='test-link', description='Тестовое описание группы'
+    )
 
 
 @pytest.fixture
 def post_with_group(user, group):
     image = tempfile.NamedTemporaryFile(suffix=".jpg").name
-    return Post.objects.create(text='Тестовый пост 2', author=user, group=group, image=image)
+    return factories.create_post(user, text='Тестовый пост 2', group=group, image=image)
 
 
 @pytest.fixture
-def few_posts_with_group(mixer, user, group):
+def few_posts_with_group(user, group):
     """Return one record with the same author and group."""
-    posts = mixer.cycle(20).blend(Post, author=user, group=group)
+    posts = factories.create_posts(20, user, group=group)
     return posts[0]
 
 
 @pytest.fixture
-def another_few_posts_with_group_with_follower(mixer, user, another_user, group):
-    mixer.blend('posts.Follow', user=user, author=another_user)
-    mixer.cycle(20).blend(Post, author=another_user, group=group)
+def another_few_posts_with_group_with_follower(user, another_user, group):
+    factories.create_follow(user, another_user)
+    factories.create_posts(20, another_user, group=group)
@@ -13,6 +13,6 @@ def user_client(user, client):
 
 
 @pytest.fixture
-def another_user(mixer):
-    from django.contrib.auth.models import User
-    return mixer.blend(User, username='AnotherUser')
+def another_user():
+    from posts.tests import factories
+    return factories.create_user('AnotherUser')
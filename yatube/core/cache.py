@@ -0,0 +1,74 @@
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+VERSION_KEY = 'version:%s'
+LOCK_KEY = 'lock:%s'
+
+
+def _new_version():
+    """Версия для потерянного ключа: больше выданных раньше.
+
+    Если ключ версии вытеснен из кеша, счёт с 1 вернул бы к жизни
+    старые записи под прежними версиями, поэтому берём время в мкс.
+    """
+    return time.time_ns() // 1000
+
+
+def get_version(namespace):
+    """Текущая версия пространства ключей кеша."""
+    key = VERSION_KEY % namespace
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return _new_version() if version is None else version
+
+
+def bump_version(namespace):
+    """Инвалидирует все ключи пространства, увеличив его версию."""
+    key = VERSION_KEY % namespace
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _new_version()
+        cache.set(key, version, None)
+        return version
+
+
+def get_versions(namespaces):
+    """Версии нескольких пространств одним запросом к кешу."""
+    keys = {VERSION_KEY % namespace: namespace for namespace in namespaces}
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        version = _new_version()
+        # add не затрёт версию, которую успел записать другой процесс.
+        for key in missing:
+            cache.add(key, version, None)
+        found.update(cache.get_many(missing))
+    return {
+        namespace: found.get(key) or _new_version()
+        for key, namespace in keys.items()
+    }
+
+
+@contextmanager
+def cache_lock(name, timeout):
+    """Блокировка на cache.add: внутри True, если её взял этот вызов.
+
+    Между процессами работает только с общим кешем (Redis, Memcached).
+    Долгая работа продлевает блокировку через refresh_lock.
+    """
+    key = LOCK_KEY % name
+    acquired = cache.add(key, True, timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(key)
+
+
+def refresh_lock(name, timeout):
+    cache.touch(LOCK_KEY % name, timeout)
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Кеши, которые видит только один процесс.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Ограничения записи и блокировки команд требуют общего кеша."""
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        'Кеш default виден только одному процессу: лимиты запросов '
+        'умножаются на число воркеров, блокировки не работают.',
+        hint='Укажите MEMCACHED_LOCATION или другой общий кеш в CACHES.',
+        id='core.W001',
+    )]
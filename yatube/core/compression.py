@@ -0,0 +1,119 @@
+import gzip
+import hashlib
+import zlib
+
+from django.core.cache import cache
+
+try:
+    import brotli
+except ImportError:  # brotli — необязательная зависимость
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 11
+
+# Расширения файлов сжатых копий статики.
+SUFFIXES = {
+    'br': '.br',
+    'gzip': '.gz',
+}
+
+
+def supported_encodings():
+    """Поддерживаемые кодировки в порядке предпочтения."""
+    if brotli is not None:
+        return ('br', 'gzip')
+    return ('gzip',)
+
+
+def accepted_encodings(accept_encoding):
+    """Разбирает Accept-Encoding, отбрасывая кодировки с q=0."""
+    accepted = set()
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        params = params.replace(' ', '')
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    return accepted
+
+
+def negotiate(accept_encoding, available=None):
+    """Выбирает лучшую кодировку, которую принимает клиент."""
+    accepted = accepted_encodings(accept_encoding or '')
+    for encoding in available or supported_encodings():
+        if encoding in accepted or '*' in accepted:
+            return encoding
+    return None
+
+
+def compress(data, encoding, quality=None):
+    if encoding == 'br':
+        return brotli.compress(
+            data, quality=BROTLI_QUALITY if quality is None else quality
+        )
+    if encoding == 'gzip':
+        return gzip.compress(
+            data, compresslevel=GZIP_LEVEL if quality is None else quality
+        )
+    raise ValueError(f'Неизвестная кодировка: {encoding}')
+
+
+class StreamCompressor:
+    """Сжимает поток по частям, сбрасывая буфер после каждого куска.
+
+    Клиент получает данные по мере генерации, а не после конца ответа.
+    """
+
+    def __init__(self, encoding, quality=None):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(
+                quality=BROTLI_QUALITY if quality is None else quality
+            )
+        else:
+            # wbits=31 — формат gzip с заголовком и контрольной суммой.
+            self._compressor = zlib.compressobj(
+                GZIP_LEVEL if quality is None else quality, zlib.DEFLATED, 31
+            )
+
+    def compress(self, chunk):
+        if self.encoding == 'br':
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return (
+            self._compressor.compress(chunk)
+            + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        )
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compress_stream(chunks, encoding, quality=None):
+    compressor = StreamCompressor(encoding, quality)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def cached_compress(data, encoding, quality, timeout):
+    """Сжимает тело, переиспользуя результат для одинакового содержимого."""
+    key = 'compressed:%s:%s:%s' % (
+        encoding, quality, hashlib.md5(data).hexdigest()
+    )
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = compress(data, encoding, quality)
+        cache.set(key, compressed, timeout)
+    return compressed
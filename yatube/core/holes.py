@@ -0,0 +1,54 @@
+"""«Дырки» в кешируемых страницах для пользовательских фрагментов.
+
+Шаблон отмечает зависящий от пользователя кусок тегом
+{% hole 'имя' параметр=значение %}. Обычно тег сразу рендерит фрагмент,
+а при рендере общей оболочки страницы для кеша оставляет метку
+<!--hole:имя:параметры-->. Метки заменяются фрагментами текущего
+пользователя при каждом ответе, поэтому одна закешированная оболочка
+годится и гостям, и вошедшим пользователям.
+"""
+import base64
+import json
+import re
+
+from django.template.loader import render_to_string
+
+HOLE_RE = re.compile(r'<!--hole:(\w+):([\w=-]*)-->')
+
+_holes = {}
+
+
+def register(template_name):
+    """Регистрирует фрагмент: функция по запросу и параметрам метки
+    возвращает контекст шаблона template_name."""
+    def decorator(func):
+        _holes[func.__name__] = (template_name, func)
+        return func
+    return decorator
+
+
+def placeholder(name, params):
+    encoded = base64.urlsafe_b64encode(
+        json.dumps(params, sort_keys=True).encode()
+    ).decode()
+    return f'<!--hole:{name}:{encoded}-->'
+
+
+def render_hole(request, name, params):
+    template_name, func = _holes[name]
+    return render_to_string(
+        template_name, func(request, **params), request=request
+    )
+
+
+def fill(content, request):
+    """Подставляет в оболочку фрагменты для текущего пользователя."""
+    def replace(match):
+        params = json.loads(base64.urlsafe_b64decode(match.group(2)))
+        return render_hole(request, match.group(1), params)
+    return HOLE_RE.sub(replace, content)
+
+
+@register('includes/holes/header_user.html')
+def header_user(request, view_name):
+    return {'view_name': view_name}
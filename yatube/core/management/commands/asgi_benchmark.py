@@ -0,0 +1,115 @@
+import asyncio
+import io
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+
+from core.asgi import WsgiToAsgi, build_environ
+
+
+def http_scope(path):
+    path, _, query = path.partition('?')
+    return {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': query.encode(),
+        'headers': [(b'host', b'localhost')],
+        'server': ('localhost', 80),
+        'client': ('127.0.0.1', 50000),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает WSGI и ASGI под одновременной нагрузкой медленных '
+        'клиентов, которые читают каждую часть ответа client-delay секунд'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/', help='Адрес страницы')
+        parser.add_argument(
+            '--requests', type=int, default=200, help='Всего запросов'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=100,
+            help='Одновременных клиентов',
+        )
+        parser.add_argument(
+            '--threads', type=int, default=settings.ASGI_THREADS,
+            help='Потоков для view в обоих режимах',
+        )
+        parser.add_argument(
+            '--client-delay', type=float, default=0.05,
+            help='Сколько секунд клиент принимает каждую часть ответа',
+        )
+
+    def handle(self, *args, **options):
+        application = get_wsgi_application()
+        self.stdout.write(
+            f'{"режим":>6} {"запросов/с":>11} {"p50, мс":>8} {"p95, мс":>8}'
+        )
+        for name, run in (('WSGI', self.run_wsgi), ('ASGI', self.run_asgi)):
+            started = time.perf_counter()
+            latencies = run(application, options)
+            elapsed = time.perf_counter() - started
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            self.stdout.write(
+                f'{name:>6} {len(latencies) / elapsed:>11.1f} '
+                f'{statistics.median(latencies) * 1000:>8.1f} '
+                f'{p95 * 1000:>8.1f}'
+            )
+
+    def run_wsgi(self, application, options):
+        """Поток занят, пока медленный клиент не примет весь ответ."""
+        def serve():
+            environ = build_environ(http_scope(options['path']), io.BytesIO())
+            body = application(environ, lambda status, headers: None)
+            try:
+                for _ in body:
+                    time.sleep(options['client_delay'])
+            finally:
+                body.close()
+
+        # Сервер с фиксированным числом потоков: остальные клиенты ждут.
+        with ThreadPoolExecutor(options['threads']) as server:
+            def request(_):
+                started = time.perf_counter()
+                server.submit(serve).result()
+                return time.perf_counter() - started
+
+            with ThreadPoolExecutor(options['concurrency']) as clients:
+                return list(clients.map(request, range(options['requests'])))
+
+    def run_asgi(self, application, options):
+        """Медленный клиент держит только корутину."""
+        asgi = WsgiToAsgi(application, options['threads'])
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                await asyncio.sleep(options['client_delay'])
+
+        async def request(semaphore):
+            async with semaphore:
+                started = time.perf_counter()
+                await asgi(http_scope(options['path']), receive, send)
+                return time.perf_counter() - started
+
+        async def main():
+            semaphore = asyncio.Semaphore(options['concurrency'])
+            return await asyncio.gather(*(
+                request(semaphore) for _ in range(options['requests'])
+            ))
+
+        try:
+            return list(asyncio.run(main()))
+        finally:
+            asgi.executor.shutdown()
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+# Запускается в отдельном интерпретаторе: в текущем всё уже импортировано.
+STARTUP_CODE = '''
+import time
+started = time.perf_counter()
+import django
+django.setup()
+if {load_urls}:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+print((time.perf_counter() - started) * 1000)
+'''
+
+
+def parse_importtime(output):
+    """Строки -X importtime: (модуль, своё время, общее время) в мкс."""
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        if not self_time.strip().isdigit():
+            continue
+        yield name.strip(), int(self_time), int(cumulative)
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает, сколько занимает холодный старт Django-процесса '
+        'и какие импорты в нём самые дорогие'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=15, help='Сколько модулей показать'
+        )
+        parser.add_argument(
+            '--no-urls',
+            action='store_true',
+            help='Не загружать URLconf, как при запуске команд manage.py',
+        )
+
+    def handle(self, *args, **options):
+        code = STARTUP_CODE.format(load_urls=not options['no_urls'])
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+            check=True,
+        )
+        imports = list(parse_importtime(result.stderr))
+        packages = Counter()
+        for name, self_time, _ in imports:
+            packages[name.split('.')[0]] += self_time
+
+        self.stdout.write(
+            f'Старт: {float(result.stdout.split()[-1]):.0f} мс, '
+            f'модулей импортировано: {len(imports)}'
+        )
+        self.stdout.write('\nПакеты по собственному времени импорта, мс:')
+        for package, total in packages.most_common(options['top']):
+            self.stdout.write(f'{total / 1000:>9.1f}  {package}')
+        self.stdout.write('\nМодули по общему времени импорта, мс:')
+        slowest = sorted(imports, key=lambda item: item[2], reverse=True)
+        for name, _, cumulative in slowest[:options['top']]:
+            self.stdout.write(f'{cumulative / 1000:>9.1f}  {name}')
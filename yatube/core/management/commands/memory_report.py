@@ -0,0 +1,109 @@
+import gc
+import os
+import signal
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import preload
+
+FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty',
+          'Private_Clean', 'Private_Dirty')
+
+
+def memory_usage(pid):
+    """Память процесса из /proc/<pid>/smaps_rollup в КБ."""
+    usage = {}
+    with open(f'/proc/{pid}/smaps_rollup') as file:
+        for line in file:
+            name, _, value = line.partition(':')
+            if name in FIELDS:
+                usage[name] = int(value.split()[0])
+    return {
+        'rss': usage['Rss'],
+        'pss': usage['Pss'],
+        'shared': usage['Shared_Clean'] + usage['Shared_Dirty'],
+        'private': usage['Private_Clean'] + usage['Private_Dirty'],
+    }
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as file:
+        return [int(child) for child in file.read().split()]
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает общую и собственную память воркеров: запущенного '
+        'мастера gunicorn (--pid) или тестовых процессов (--fork)'
+    )
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group(required=True)
+        group.add_argument(
+            '--pid', type=int, help='PID мастера gunicorn'
+        )
+        group.add_argument(
+            '--fork',
+            type=int,
+            metavar='N',
+            help='Прогреть процесс, запустить N дочерних и сравнить',
+        )
+        parser.add_argument(
+            '--no-freeze',
+            action='store_true',
+            help='С --fork: не вызывать gc.freeze() перед fork',
+        )
+
+    def handle(self, *args, **options):
+        if not sys.platform.startswith('linux'):
+            raise CommandError('Нужен /proc/<pid>/smaps_rollup (Linux)')
+        if options['pid']:
+            self.report(options['pid'], children(options['pid']))
+        else:
+            self.fork(options['fork'], not options['no_freeze'])
+
+    def report(self, master, workers):
+        self.stdout.write(
+            f'{"процесс":>10} {"RSS, КБ":>9} {"PSS, КБ":>9} '
+            f'{"общая, КБ":>10} {"своя, КБ":>9}'
+        )
+        total_private = 0
+        for label, pid in [('мастер', master)] + [
+            (str(worker), worker) for worker in workers
+        ]:
+            usage = memory_usage(pid)
+            if pid != master:
+                total_private += usage['private']
+            self.stdout.write(
+                f'{label:>10} {usage["rss"]:>9} {usage["pss"]:>9} '
+                f'{usage["shared"]:>10} {usage["private"]:>9}'
+            )
+        if workers:
+            self.stdout.write(
+                f'Своя память воркера в среднем: '
+                f'{total_private // len(workers)} КБ'
+            )
+
+    def fork(self, count, freeze):
+        summary = preload.warm_up()
+        self.stdout.write(f'Прогрев: {summary}')
+        if freeze:
+            self.stdout.write(f'Заморожено объектов: {preload.freeze()}')
+        pids = []
+        for _ in range(count):
+            pid = os.fork()
+            if pid == 0:
+                # Полная сборка мусора, как в работающем воркере.
+                gc.collect()
+                time.sleep(60)
+                os._exit(0)
+            pids.append(pid)
+        try:
+            time.sleep(1)
+            self.report(os.getpid(), pids)
+        finally:
+            for pid in pids:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
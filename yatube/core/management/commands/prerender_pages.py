@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.prerender import prerender
+
+
+class Command(BaseCommand):
+    help = 'Заранее рендерит статические страницы PRERENDER_VIEWS в файлы'
+
+    def handle(self, *args, **options):
+        for view_name in settings.PRERENDER_VIEWS:
+            url = prerender(view_name)
+            self.stdout.write(f'{url} готов')
+        self.stdout.write(self.style.SUCCESS('Готово'))
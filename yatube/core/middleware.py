@@ -0,0 +1,246 @@
+import os
+import re
+from urllib.parse import parse_qsl, urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from . import holes
+from .cache import get_version
+from .compression import (cached_compress, compress, compress_stream,
+                          negotiate)
+from .prerender import prerendered_path
+from .responses import file_response
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/atom+xml',
+    'application/rss+xml',
+    'image/svg+xml',
+)
+# Для динамических ответов brotli с качеством 11 слишком медленный.
+DYNAMIC_QUALITY = {
+    'br': 5,
+    'gzip': 6,
+}
+STRONG_ETAG_RE = re.compile(r'^"')
+HTML_CONTENT_TYPE = 'text/html; charset=utf-8'
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Сжимает ответы brotli или gzip в зависимости от Accept-Encoding.
+
+    Обычные ответы меньше COMPRESSION_MIN_SIZE не сжимаются. Сжатое тело
+    кешируется по хешу содержимого, только если ответ общий для многих
+    запросов (response._shared_body, его ставит PageCacheMiddleware):
+    страницы с токеном CSRF уникальны и лишь вытесняли бы кеш.
+    Потоковые ответы сжимаются по частям.
+    """
+
+    def process_response(self, request, response):
+        if (
+            response.status_code != 200
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith(
+                COMPRESSIBLE_TYPES
+            )
+        ):
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        quality = DYNAMIC_QUALITY[encoding]
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding, quality
+            )
+            del response['Content-Length']
+        else:
+            if getattr(response, '_shared_body', False):
+                compressed = cached_compress(
+                    response.content,
+                    encoding,
+                    quality,
+                    settings.COMPRESSION_CACHE_TIMEOUT,
+                )
+            else:
+                compressed = compress(response.content, encoding, quality)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        if response.has_header('ETag'):
+            response['ETag'] = STRONG_ETAG_RE.sub('W/"', response['ETag'])
+        response['Content-Encoding'] = encoding
+        return response
+
+
+PAGE_KEY = 'page:%s:%s:%s'
+
+
+def page_cache_key(request, variant):
+    """Ключ страницы: путь и отсортированные непустые параметры.
+
+    variant — 'shell' для оболочки с метками фрагментов или 'anonymous'
+    для готовой страницы гостя.
+    """
+    query = sorted(parse_qsl(request.META.get('QUERY_STRING', '')))
+    path = request.path
+    if query:
+        path += '?' + urlencode(query)
+    return PAGE_KEY % (get_version('pages'), variant, path)
+
+
+class PageCacheMiddleware(MiddlewareMixin):
+    """Кеширует страницы PAGE_CACHE_VIEWS, общие для всех пользователей.
+
+    В кеше лежит оболочка страницы с метками пользовательских
+    фрагментов (core.holes) — их подставляют при каждом ответе.
+    Гостю без cookie сессии готовая страница отдаётся ещё до сессий
+    и CSRF, не доходя до view. Кеш сбрасывается сигналами постов,
+    комментариев и подписок.
+    """
+
+    def _cacheable(self, request):
+        if (
+            not settings.PAGE_CACHE_SECONDS
+            or request.method not in ('GET', 'HEAD')
+            or 'HTTP_AUTHORIZATION' in request.META
+        ):
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return match.view_name in settings.PAGE_CACHE_VIEWS
+
+    def process_request(self, request):
+        request._page_cacheable = self._cacheable(request)
+        if (
+            request._page_cacheable
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        ):
+            return cache.get(page_cache_key(request, 'anonymous'))
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(request, '_page_cacheable', False):
+            return None
+        shell_key = page_cache_key(request, 'shell')
+        shell = cache.get(shell_key)
+        if shell is None:
+            request._page_shell = True
+            try:
+                shell = view_func(request, *view_args, **view_kwargs)
+            finally:
+                request._page_shell = False
+            if (
+                shell.status_code != 200
+                or shell.streaming
+                or shell.cookies
+            ):
+                return self._fill(shell, request)
+            if request.method == 'GET':
+                cache.set(shell_key, shell, settings.PAGE_CACHE_SECONDS)
+        response = self._fill(shell, request)
+        if not request.user.is_authenticated and request.method == 'GET':
+            patch_vary_headers(response, ('Cookie',))
+            # Страница гостя одна на всех — её сжатое тело можно кешировать.
+            response._shared_body = True
+            request._page_store_anonymous = True
+        return response
+
+    def process_response(self, request, response):
+        # Страница гостя сохраняется здесь, когда внутренние middleware
+        # уже добавили свои заголовки (X-Frame-Options и прочие).
+        if (
+            getattr(request, '_page_store_anonymous', False)
+            and response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+        ):
+            cache.set(
+                page_cache_key(request, 'anonymous'),
+                response,
+                settings.PAGE_CACHE_SECONDS,
+            )
+        return response
+
+    def _fill(self, shell, request):
+        if shell.streaming:
+            return shell
+        content = holes.fill(shell.content.decode(shell.charset), request)
+        response = HttpResponse(
+            content,
+            status=shell.status_code,
+            content_type=shell['Content-Type'],
+        )
+        for name, value in shell.cookies.items():
+            response.cookies[name] = value
+        return response
+
+
+class PrerenderedPageMiddleware(MiddlewareMixin):
+    """Отдаёт заранее отрендеренные страницы PRERENDER_VIEWS.
+
+    Гость без cookie сессии получает файл целиком, вошедшему
+    пользователю в оболочку подставляются его фрагменты. Ответ
+    возвращается из process_view, чтобы внутренние middleware добавили
+    свои заголовки. Пока команда prerender_pages не запускалась,
+    работает обычный view.
+    """
+
+    def process_request(self, request):
+        request._prerendered_page = request._prerendered_shell = None
+        if (
+            not settings.SERVE_PRERENDERED
+            or request.method not in ('GET', 'HEAD')
+        ):
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if match.view_name not in settings.PRERENDER_VIEWS:
+            return None
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            path = prerendered_path(request.path_info, 'page')
+            if path and os.path.exists(path):
+                request._prerendered_page = path
+                return None
+        path = prerendered_path(request.path_info, 'shell')
+        if path and os.path.exists(path):
+            request._prerendered_shell = path
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(request, '_prerendered_page', None):
+            response = file_response(
+                request, request._prerendered_page, HTML_CONTENT_TYPE
+            )
+            patch_vary_headers(response, ('Cookie',))
+            patch_cache_control(
+                response, public=True, max_age=settings.PRERENDER_MAX_AGE
+            )
+            return response
+        if not getattr(request, '_prerendered_shell', None):
+            return None
+        with open(request._prerendered_shell, encoding='utf-8') as file:
+            content = holes.fill(file.read(), request)
+        return HttpResponse(content, content_type=HTML_CONTENT_TYPE)
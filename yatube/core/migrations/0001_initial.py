@@ -0,0 +1,28 @@
+# Generated by Django 2.2.16 on 2026-10-19 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Имя файла')),
+                ('size', models.PositiveIntegerField(verbose_name='Размер')),
+                ('refcount', models.PositiveIntegerField(default=1, verbose_name='Число ссылок')),
+            ],
+            options={
+                'verbose_name': 'Сохранённый файл',
+                'verbose_name_plural': 'Сохранённые файлы',
+            },
+        ),
+    ]
@@ -10,3 +10,21 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class StoredFile(CreatedModel):
+    """Уникальное содержимое в ContentAddressedStorage.
+
+    refcount — сколько сохранений ссылается на файл; файл удаляется
+    с диска, когда удалена последняя ссылка.
+    """
+    name = models.CharField('Имя файла', max_length=255, unique=True)
+    size = models.PositiveIntegerField('Размер')
+    refcount = models.PositiveIntegerField('Число ссылок', default=1)
+
+    class Meta:
+        verbose_name = 'Сохранённый файл'
+        verbose_name_plural = 'Сохранённые файлы'
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,92 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def estimate_table_rows(model, using='default'):
+    """Примерное число строк таблицы без полного прохода по ней.
+
+    PostgreSQL и MySQL хранят оценку в статистике, для SQLite берётся
+    максимальный rowid — верхняя граница, которую видно по индексу.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [table],
+            )
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                'SELECT table_rows FROM information_schema.tables '
+                'WHERE table_schema = DATABASE() AND table_name = %s',
+                [table],
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                'SELECT MAX(rowid) FROM %s' % connection.ops.quote_name(table)
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None:
+        return None
+    return max(int(row[0]), 0)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Не считает COUNT(*) по всей большой таблице.
+
+    Для запроса без фильтров берётся оценка из статистики БД, если она
+    больше ESTIMATED_COUNT_THRESHOLD. Отфильтрованные и небольшие
+    выборки считаются точно.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = estimate_table_rows(queryset.model, queryset.db)
+            if (
+                estimate is not None
+                and estimate >= settings.ESTIMATED_COUNT_THRESHOLD
+            ):
+                return estimate
+        return super().count
+
+
+class CachedCountPaginator(EstimatedCountPaginator):
+    """Считает COUNT(*) большой выборки не чаще раза в несколько минут.
+
+    Выборка до PAGINATOR_EXACT_COUNT записей считается точно запросом
+    с LIMIT. Число записей большой выборки — оценка или точный подсчёт
+    EstimatedCountPaginator — хранится в кеше PAGINATOR_COUNT_TIMEOUT
+    секунд, поэтому последние страницы могут быть чуть устаревшими.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+        queryset = queryset.order_by()
+        limit = settings.PAGINATOR_EXACT_COUNT
+        bounded = queryset[:limit + 1].count()
+        if bounded <= limit:
+            return bounded
+        key = 'paginator_count:%s:%s' % (
+            queryset.db,
+            hashlib.md5(str(queryset.query).encode()).hexdigest(),
+        )
+        count = cache.get(key)
+        if count is None:
+            count = max(super().count, bounded)
+            cache.set(key, count, settings.PAGINATOR_COUNT_TIMEOUT)
+        return count
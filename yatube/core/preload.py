@@ -0,0 +1,74 @@
+"""Прогрев процесса перед fork воркеров gunicorn (см. gunicorn.conf.py).
+
+Всё, что воркеры иначе загрузили бы каждый сам, загружается один раз
+в мастере: URLconf, шаблоны, метаданные моделей и каталоги переводов.
+Затем gc.freeze() убирает эти объекты из отслеживания сборщиком
+мусора: он не пишет в их заголовки, и страницы памяти остаются общими
+для всех воркеров (copy-on-write).
+"""
+import gc
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.urls import get_resolver
+from django.utils import translation
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def warm_urls():
+    resolver = get_resolver()
+    # reverse_dict заполняется при первом reverse() — делаем это сейчас.
+    resolver.reverse_dict
+    return len(resolver.url_patterns)
+
+
+def warm_templates():
+    loaded = 0
+    for engine in engines.all():
+        for directory in getattr(engine, 'template_dirs', ()):
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if not name.endswith(TEMPLATE_EXTENSIONS):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        engine.get_template(
+                            os.path.relpath(path, directory)
+                        )
+                    except (TemplateDoesNotExist, TemplateSyntaxError):
+                        continue
+                    loaded += 1
+    return loaded
+
+
+def warm_models():
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+    return len(models)
+
+
+def warm_translations():
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext('')
+    return settings.LANGUAGE_CODE
+
+
+def warm_up():
+    """Загружает всё разделяемое; возвращает сводку для лога."""
+    return {
+        'urls': warm_urls(),
+        'templates': warm_templates(),
+        'models': warm_models(),
+        'language': warm_translations(),
+    }
+
+
+def freeze():
+    """Вызывается в мастере последним шагом перед fork воркеров."""
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
@@ -0,0 +1,87 @@
+"""Заранее отрендеренные статические страницы (PRERENDER_VIEWS).
+
+Команда prerender_pages кладёт для каждой страницы два файла:
+готовую страницу гостя и оболочку с метками пользовательских
+фрагментов (core.holes). PrerenderedPageMiddleware отдаёт их, минуя
+view и шаблоны.
+"""
+import io
+import os
+import tempfile
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import resolve, reverse
+from django.utils._os import safe_join
+
+from . import holes
+from .asgi import build_environ
+
+FILENAMES = {
+    'page': 'index.html',
+    'shell': 'index.shell.html',
+}
+
+
+def prerendered_path(path, variant):
+    """Файл варианта страницы с адресом path или None."""
+    try:
+        return safe_join(
+            settings.PRERENDER_ROOT, path.strip('/'), FILENAMES[variant]
+        )
+    except SuspiciousFileOperation:
+        return None
+
+
+def _write(path, content):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def build_request(url):
+    """GET-запрос гостя к url на хосте из PRERENDER_BASE_URL.
+
+    Хост проходит обычную проверку ALLOWED_HOSTS, а ссылки
+    build_absolute_uri на странице ведут на настоящий сайт.
+    """
+    base = urlsplit(settings.PRERENDER_BASE_URL)
+    port = base.port or (443 if base.scheme == 'https' else 80)
+    scope = {
+        'method': 'GET',
+        'path': unquote(url),
+        'scheme': base.scheme,
+        'server': (base.hostname, port),
+        'headers': [(b'host', base.netloc.encode())],
+    }
+    return WSGIRequest(build_environ(scope, io.BytesIO()))
+
+
+def prerender(view_name):
+    """Рендерит страницу как для гостя и сохраняет оба варианта."""
+    url = reverse(view_name)
+    request = build_request(url)
+    request.user = AnonymousUser()
+    request.resolver_match = match = resolve(url)
+    request._page_shell = True
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    request._page_shell = False
+    shell = response.content.decode(response.charset)
+    _write(prerendered_path(url, 'shell'), shell.encode())
+    _write(
+        prerendered_path(url, 'page'),
+        holes.fill(shell, request).encode(),
+    )
+    return url
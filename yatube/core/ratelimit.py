@@ -0,0 +1,109 @@
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import render
+
+COUNTER_KEY = 'ratelimit:%s:%s:%s'
+LATENCY_KEY = 'write_latency'
+PROBE_KEY = 'write_probe'
+# Вес нового замера в скользящем среднем задержки записи.
+LATENCY_ALPHA = 0.2
+
+
+def client_key(request):
+    """Пользователь для вошедших, IP-адрес для гостей."""
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'ip:{request.META.get("REMOTE_ADDR", "")}'
+
+
+def hit(scope, key, limit, period):
+    """Учитывает запрос в текущем окне: не больше limit за period секунд.
+
+    Возвращает 0, если запрос разрешён, иначе сколько секунд до начала
+    следующего окна. Счётчик окна увеличивается атомарно (add и incr),
+    поэтому одновременные запросы не проскакивают лимит.
+    """
+    now = time.time()
+    window = int(now // period)
+    counter_key = COUNTER_KEY % (scope, key, window)
+    cache.add(counter_key, 0, period)
+    try:
+        count = cache.incr(counter_key)
+    except ValueError:
+        # Счётчик истёк между add и incr — окно только что сменилось.
+        cache.add(counter_key, 1, period)
+        count = 1
+    if count <= limit:
+        return 0
+    return (window + 1) * period - now
+
+
+def write_overloaded():
+    """Запись перегружена: средняя задержка выше порога.
+
+    Если WRITE_SHED_RETRY_AFTER секунд не было замеров, пропускаем
+    один пробный запрос, чтобы обновить оценку, когда нагрузка спадёт.
+    Остальные ждут, пока проба не запишет свою задержку.
+    """
+    latency, updated = cache.get(LATENCY_KEY, (0, 0))
+    if latency <= settings.WRITE_SHED_LATENCY:
+        return False
+    if time.time() - updated < settings.WRITE_SHED_RETRY_AFTER:
+        return True
+    return not cache.add(PROBE_KEY, True, settings.WRITE_SHED_RETRY_AFTER)
+
+
+def record_write_latency(seconds):
+    # Потерянное при гонке обновление среднего не страшно, поэтому
+    # без блокировки.
+    latency, _ = cache.get(LATENCY_KEY, (seconds, 0))
+    latency = LATENCY_ALPHA * seconds + (1 - LATENCY_ALPHA) * latency
+    cache.set(LATENCY_KEY, (latency, time.time()), None)
+
+
+def _reject(request, status, retry_after):
+    retry_after = max(1, math.ceil(retry_after))
+    response = render(
+        request,
+        f'core/{status}.html',
+        {'retry_after': retry_after},
+        status=status,
+    )
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def ratelimit(scope):
+    """Ограничивает POST-запросы к view по настройке RATELIMITS[scope].
+
+    Проверки идут до вызова view, то есть до любой работы с базой:
+    сначала сброс нагрузки (503), затем счётчик окна (429). Счётчики
+    лежат в кеше default, который должен быть общим для всех процессов
+    (проверка core.W001).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'POST':
+                return view(request, *args, **kwargs)
+            if write_overloaded():
+                return _reject(
+                    request, 503, settings.WRITE_SHED_RETRY_AFTER
+                )
+            limit, period = settings.RATELIMITS[scope]
+            retry_after = hit(
+                scope, client_key(request), limit, period
+            )
+            if retry_after:
+                return _reject(request, 429, retry_after)
+            started = time.monotonic()
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                record_write_latency(time.monotonic() - started)
+        return wrapper
+    return decorator
@@ -0,0 +1,120 @@
+import os
+import re
+
+from django.http import (FileResponse, HttpResponse,
+                         HttpResponseNotModified, StreamingHttpResponse)
+from django.utils.http import http_date, parse_etags
+from django.views.static import was_modified_since
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def file_etag(stat):
+    return '"%x-%x"' % (int(stat.st_mtime), stat.st_size)
+
+
+def parse_range(header, size):
+    """Возвращает (start, end) включительно, None или False.
+
+    None — заголовка нет или он не поддерживается (несколько диапазонов),
+    отдаём файл целиком; False — диапазон невыполним.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # bytes=-N: последние N байт
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read_range(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _weak(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def etag_matches(if_none_match, etag):
+    """Слабое сравнение для If-None-Match (RFC 7232, 3.2).
+
+    CompressionMiddleware делает ETag сжатого ответа слабым, и клиент
+    присылает его обратно с W/.
+    """
+    etags = parse_etags(if_none_match)
+    return '*' in etags or _weak(etag) in {_weak(tag) for tag in etags}
+
+
+def _not_modified(request, etag, stat):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    return not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'),
+        stat.st_mtime,
+        stat.st_size,
+    )
+
+
+def file_response(request, path, content_type):
+    """Ответ с файлом: ETag, If-Modified-Since и Range.
+
+    Файл целиком уходит через FileResponse, так что WSGI-сервер
+    может передать его через wsgi.file_wrapper (sendfile).
+    """
+    stat = os.stat(path)
+    etag = file_etag(stat)
+    last_modified = http_date(stat.st_mtime)
+
+    if _not_modified(request, etag, stat):
+        response = HttpResponseNotModified()
+    else:
+        byte_range = None
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if if_range is None or if_range in (etag, last_modified):
+            byte_range = parse_range(
+                request.META.get('HTTP_RANGE', ''), stat.st_size
+            )
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = 'bytes */%d' % stat.st_size
+            return response
+        if byte_range is None:
+            response = FileResponse(
+                open(path, 'rb'), content_type=content_type
+            )
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _read_range(path, start, end),
+                status=206,
+                content_type=content_type,
+            )
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = 'bytes %d-%d/%d' % (
+                start, end, stat.st_size
+            )
+        response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    return response
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import posixpath
+import re
+import threading
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import FileSystemStorage, Storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+from django.utils.encoding import filepath_to_uri
+
+from .compression import SUFFIXES, compress, supported_encodings
+from .models import StoredFile
+
+# каталог/ab/cdef….ext — имя из SHA-256 содержимого
+CONTENT_HASHED_RE = re.compile(r'(^|/)[0-9a-f]{2}/[0-9a-f]{62}(\.\w+)?$')
+
+
+def is_content_hashed(name):
+    """Имя из ContentAddressedStorage: содержимое под ним не меняется."""
+    return CONTENT_HASHED_RE.search(name) is not None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хешем в имени файла и сжатыми копиями .gz/.br.
+
+    collectstatic пишет манифест и рядом с каждым текстовым файлом
+    кладёт заранее сжатые варианты, которые отдаёт core.views.serve_static.
+    """
+    manifest_strict = False
+    compress_extensions = (
+        '.css', '.js', '.svg', '.html', '.txt', '.xml', '.json',
+        '.ico', '.map', '.eot', '.ttf', '.otf',
+    )
+    _hashed_names = None
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        self._hashed_names = None
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            extension = os.path.splitext(name)[1].lower()
+            if extension not in self.compress_extensions:
+                continue
+            with self.open(name) as original:
+                content = original.read()
+            for encoding in supported_encodings():
+                compressed_name = self._save_compressed(
+                    name, content, encoding
+                )
+                if compressed_name:
+                    yield name, compressed_name, True
+
+    def _save_compressed(self, name, content, encoding):
+        compressed = compress(content, encoding)
+        # Сжатие не окупилось — клиент получит исходный файл.
+        if len(compressed) >= len(content):
+            return None
+        compressed_name = name + SUFFIXES[encoding]
+        if self.exists(compressed_name):
+            self.delete(compressed_name)
+        return self._save(compressed_name, ContentFile(compressed))
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # collectstatic ещё не запускался — отдаём исходное имя.
+            return name
+
+    def is_hashed(self, name):
+        """Имя из манифеста: содержимое файла под ним не меняется."""
+        if self._hashed_names is None:
+            self._hashed_names = frozenset(self.hashed_files.values())
+        return name in self._hashed_names
+
+
+@deconstructible
+class InMemoryStorage(Storage):
+    """Хранилище файлов в памяти процесса для тестов.
+
+    Загрузки не пишутся на диск и не пересекаются между параллельными
+    процессами тестов.
+    """
+
+    def __init__(self, base_url=None):
+        self.base_url = base_url
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def _open(self, name, mode='rb'):
+        with self._lock:
+            content, _ = self._files[name]
+        file = ContentFile(content, name=name)
+        file.mode = mode
+        return file
+
+    def _save(self, name, content):
+        content.seek(0)
+        data = content.read()
+        if isinstance(data, str):
+            data = data.encode()
+        with self._lock:
+            self._files[name] = (data, timezone.now())
+        return name
+
+    def delete(self, name):
+        with self._lock:
+            self._files.pop(name, None)
+
+    def exists(self, name):
+        return name in self._files
+
+    def listdir(self, path):
+        prefix = path.rstrip('/') + '/' if path else ''
+        directories, files = set(), []
+        for name in list(self._files):
+            if not name.startswith(prefix):
+                continue
+            head, _, tail = name[len(prefix):].partition('/')
+            if tail:
+                directories.add(head)
+            else:
+                files.append(head)
+        return sorted(directories), sorted(files)
+
+    def size(self, name):
+        return len(self._files[name][0])
+
+    def url(self, name):
+        base_url = self.base_url or settings.MEDIA_URL
+        return base_url + filepath_to_uri(name)
+
+    def get_modified_time(self, name):
+        return self._files[name][1]
+
+    get_created_time = get_accessed_time = get_modified_time
+
+
+class ContentAddressedMixin:
+    """Хранит файлы под хешем содержимого, каждый — один раз.
+
+    Повторная загрузка того же файла только увеличивает счётчик ссылок
+    в StoredFile и получает то же имя, а с ним и готовые миниатюры.
+    delete() уменьшает счётчик и удаляет файл вместе с последней ссылкой.
+    """
+
+    def hashed_name(self, name, content):
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        digest = sha256.hexdigest()
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(
+            posixpath.dirname(name.replace('\\', '/')),
+            digest[:2],
+            digest[2:] + extension,
+        )
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.hashed_name(name, content)
+        with transaction.atomic():
+            _, created = StoredFile.objects.get_or_create(
+                name=name, defaults={'size': content.size}
+            )
+            if not created:
+                StoredFile.objects.filter(name=name).update(
+                    refcount=F('refcount') + 1
+                )
+            if not self.exists(name):
+                saved = self._save(name, content)
+                # Тот же файл успел записать параллельный запрос.
+                if saved != name:
+                    super().delete(saved)
+        return name
+
+    def delete(self, name):
+        with transaction.atomic():
+            if StoredFile.objects.filter(name=name, refcount__gt=1).update(
+                refcount=F('refcount') - 1
+            ):
+                return
+            StoredFile.objects.filter(name=name).delete()
+        super().delete(name)
+
+
+@deconstructible
+class ContentAddressedStorage(ContentAddressedMixin, FileSystemStorage):
+    """Файлы по хешу содержимого в MEDIA_ROOT."""
+
+
+@deconstructible
+class InMemoryContentAddressedStorage(ContentAddressedMixin, InMemoryStorage):
+    """ContentAddressedStorage в памяти: тесты проверяют учёт ссылок."""
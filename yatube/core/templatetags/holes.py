@@ -0,0 +1,15 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from .. import holes
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def hole(context, name, **params):
+    """Пользовательский фрагмент или метка для него в оболочке страницы."""
+    request = context.get('request')
+    if getattr(request, '_page_shell', False):
+        return mark_safe(holes.placeholder(name, params))
+    return mark_safe(holes.render_hole(request, name, params))
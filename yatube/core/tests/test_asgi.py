@@ -0,0 +1,93 @@
+import asyncio
+
+from django.core.wsgi import get_wsgi_application
+from django.test import SimpleTestCase
+
+from ..asgi import WsgiToAsgi, build_environ
+
+
+def scope(path, method='GET', headers=()):
+    return {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': b'a=1',
+        'headers': list(headers),
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 5000),
+    }
+
+
+class AsgiTests(SimpleTestCase):
+    def setUp(self):
+        self.application = WsgiToAsgi(get_wsgi_application(), 2)
+
+    def tearDown(self):
+        if self.application.executor is not None:
+            self.application.executor.shutdown()
+
+    def call(self, scope, messages):
+        sent = []
+        messages = iter(messages)
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(self.application(scope, receive, send))
+        return sent
+
+    def test_page(self):
+        """Страница отдаётся через ASGI со статусом и заголовками"""
+        sent = self.call(
+            scope('/about/author/'), [{'type': 'http.request'}]
+        )
+        self.assertEqual(sent[0]['type'], 'http.response.start')
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn(
+            (b'content-type', b'text/html; charset=utf-8'),
+            sent[0]['headers'],
+        )
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertIn('Привет! Я автор'.encode(), body)
+
+    def test_environ(self):
+        """Заголовки и тело запроса попадают в WSGI environ"""
+        environ = build_environ(
+            scope('/профиль/', 'POST', [
+                (b'content-type', b'text/plain'),
+                (b'accept', b'text/html'),
+                (b'accept', b'*/*'),
+            ]),
+            None,
+        )
+        self.assertEqual(environ['CONTENT_TYPE'], 'text/plain')
+        self.assertEqual(environ['HTTP_ACCEPT'], 'text/html,*/*')
+        self.assertEqual(
+            environ['PATH_INFO'].encode('latin-1').decode(), '/профиль/'
+        )
+        self.assertEqual(environ['QUERY_STRING'], 'a=1')
+
+    def test_disconnect_before_body(self):
+        """Отключившийся клиент не занимает поток"""
+        sent = self.call(
+            scope('/about/author/', 'POST'),
+            [{'type': 'http.request', 'body': b'a', 'more_body': True},
+             {'type': 'http.disconnect'}],
+        )
+        self.assertEqual(sent, [])
+        self.assertIsNone(self.application.executor)
+
+    def test_lifespan(self):
+        """Пул потоков создаётся при старте и закрывается при остановке"""
+        sent = self.call(
+            {'type': 'lifespan'},
+            [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}],
+        )
+        self.assertEqual(
+            [message['type'] for message in sent],
+            ['lifespan.startup.complete', 'lifespan.shutdown.complete'],
+        )
+        self.assertIsNone(self.application.executor)
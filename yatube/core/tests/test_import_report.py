@@ -0,0 +1,18 @@
+from django.test import SimpleTestCase
+
+from ..management.commands.import_report import parse_importtime
+
+OUTPUT = '''import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   posts.forms
+import time:       300 |        420 | posts.views
+Traceback-free noise
+'''
+
+
+class ImportReportTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        """Из вывода -X importtime берутся только строки модулей"""
+        self.assertEqual(
+            list(parse_importtime(OUTPUT)),
+            [('posts.forms', 120, 120), ('posts.views', 300, 420)],
+        )
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+
+from django.test import Client, TestCase, override_settings
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+TEST_IMAGE = bytes(range(256)) * 4
+HASHED_NAME = 'posts/ab/' + 'c' * 62 + '.jpg'
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, MEDIA_OFFLOAD='')
+class MediaServingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(TEMP_MEDIA_ROOT, 'posts'), exist_ok=True)
+        with open(os.path.join(TEMP_MEDIA_ROOT, 'posts', 'a.jpg'), 'wb') as f:
+            f.write(TEST_IMAGE)
+        hashed_path = os.path.join(TEMP_MEDIA_ROOT, HASHED_NAME)
+        os.makedirs(os.path.dirname(hashed_path), exist_ok=True)
+        with open(hashed_path, 'wb') as f:
+            f.write(TEST_IMAGE)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.url = '/media/posts/a.jpg'
+
+    def test_full_file(self):
+        """Файл отдаётся целиком с ETag и Accept-Ranges"""
+        response = self.guest_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertTrue(response.has_header('ETag'))
+        self.assertEqual(b''.join(response.streaming_content), TEST_IMAGE)
+
+    def test_range_request(self):
+        """Range отдаёт запрошенный кусок со статусом 206"""
+        cases = {
+            'bytes=0-9': (TEST_IMAGE[:10], 'bytes 0-9/1024'),
+            'bytes=1000-': (TEST_IMAGE[1000:], 'bytes 1000-1023/1024'),
+            'bytes=-4': (TEST_IMAGE[-4:], 'bytes 1020-1023/1024'),
+        }
+        for header, (body, content_range) in cases.items():
+            with self.subTest(header=header):
+                response = self.guest_client.get(self.url, HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response['Content-Range'], content_range)
+                self.assertEqual(b''.join(response.streaming_content), body)
+
+    def test_unsatisfiable_range(self):
+        """Невыполнимый диапазон возвращает 416"""
+        response = self.guest_client.get(self.url, HTTP_RANGE='bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_conditional_requests(self):
+        """If-None-Match и If-Modified-Since возвращают 304"""
+        response = self.guest_client.get(self.url)
+        etag = response['ETag']
+        last_modified = response['Last-Modified']
+        response = self.guest_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        response = self.guest_client.get(
+            self.url, HTTP_IF_NONE_MATCH=f'"other", W/{etag}'
+        )
+        self.assertEqual(response.status_code, 304)
+        response = self.guest_client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_and_outside_files(self):
+        """Отсутствующие файлы и выход за MEDIA_ROOT дают 404"""
+        for url in ('/media/posts/none.jpg', '/media/../manage.py'):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, 404)
+
+    @override_settings(MEDIA_OFFLOAD='x-accel-redirect')
+    def test_accel_redirect(self):
+        """Передача файла отдаётся nginx через X-Accel-Redirect"""
+        response = self.guest_client.get(self.url)
+        self.assertEqual(
+            response['X-Accel-Redirect'], '/protected-media/posts/a.jpg'
+        )
+        self.assertEqual(response.content, b'')
+
+    @override_settings(MEDIA_OFFLOAD='x-sendfile')
+    def test_sendfile(self):
+        """Передача файла отдаётся прокси через X-Sendfile"""
+        response = self.guest_client.get(self.url)
+        self.assertEqual(
+            response['X-Sendfile'],
+            os.path.join(TEMP_MEDIA_ROOT, 'posts', 'a.jpg'),
+        )
+
+    def test_content_hashed_file_is_immutable(self):
+        """Файл с хешем содержимого в имени кешируется навсегда"""
+        response = self.guest_client.get('/media/' + HASHED_NAME)
+        self.assertEqual(
+            response['Cache-Control'], 'public, max-age=31536000, immutable'
+        )
+        response = self.guest_client.get(self.url)
+        self.assertFalse(response.has_header('Cache-Control'))
@@ -0,0 +1,91 @@
+import gzip
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+
+from .. import compression
+from ..middleware import CompressionMiddleware
+
+PAGE = ('<p>Тестовый пост</p>' * 200).encode()
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def process(self, response, **headers):
+        request = self.factory.get('/', **headers)
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(request)
+
+    def test_gzip_page(self):
+        """HTML-страница сжимается gzip"""
+        response = self.process(
+            HttpResponse(PAGE), HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), PAGE)
+        self.assertEqual(
+            response['Content-Length'], str(len(response.content))
+        )
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_small_and_binary_responses_untouched(self):
+        """Маленькие ответы и картинки не сжимаются"""
+        responses = [
+            HttpResponse(b'<p>ok</p>'),
+            HttpResponse(PAGE, content_type='image/png'),
+        ]
+        for response in responses:
+            with self.subTest(content_type=response['Content-Type']):
+                response = self.process(
+                    response, HTTP_ACCEPT_ENCODING='gzip'
+                )
+                self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_no_accept_encoding(self):
+        """Без Accept-Encoding ответ не сжимается"""
+        response = self.process(HttpResponse(PAGE))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, PAGE)
+
+    def test_streaming_response(self):
+        """Потоковый ответ сжимается по частям"""
+        chunks = [PAGE[:1000], PAGE[1000:]]
+        response = self.process(
+            StreamingHttpResponse(iter(chunks)),
+            HTTP_ACCEPT_ENCODING='gzip',
+        )
+        parts = list(response.streaming_content)
+        self.assertGreater(len(parts), 1)
+        self.assertEqual(gzip.decompress(b''.join(parts)), PAGE)
+        self.assertFalse(response.has_header('Content-Length'))
+
+    def shared(self, content):
+        response = HttpResponse(content)
+        response._shared_body = True
+        return response
+
+    def test_shared_body_is_cached(self):
+        """Общая для всех страница не сжимается повторно"""
+        with mock.patch(
+            'core.compression.compress', wraps=compression.compress
+        ) as compress:
+            for _ in range(2):
+                response = self.process(
+                    self.shared(PAGE), HTTP_ACCEPT_ENCODING='gzip'
+                )
+                self.assertEqual(gzip.decompress(response.content), PAGE)
+        self.assertEqual(compress.call_count, 1)
+
+    def test_personal_body_not_cached(self):
+        """Обычный ответ сжимается без записи в кеш"""
+        with mock.patch('core.compression.cache') as compression_cache:
+            response = self.process(
+                HttpResponse(PAGE), HTTP_ACCEPT_ENCODING='gzip'
+            )
+        self.assertEqual(gzip.decompress(response.content), PAGE)
+        compression_cache.set.assert_not_called()
@@ -0,0 +1,127 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post, User
+
+
+@override_settings(PAGE_CACHE_SECONDS=60)
+class PageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text='Тестовый пост'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:group_posts', args=(self.group.slug,))
+
+    def test_anonymous_page_cached(self):
+        """Повторный запрос гостя отдаётся из кеша без запросов к базе"""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(first.content, second.content)
+        self.assertIsNone(second.context)
+
+    def test_cached_page_keeps_security_headers(self):
+        """Страница гостя из кеша отдаётся с заголовками middleware"""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(first['X-Frame-Options'], 'SAMEORIGIN')
+        self.assertEqual(second['X-Frame-Options'], 'SAMEORIGIN')
+
+    def test_only_guest_page_marked_shared(self):
+        """Сжатое тело кешируется только для общей страницы гостя"""
+        self.assertTrue(self.client.get(self.url)._shared_body)
+        self.assertTrue(self.client.get(self.url)._shared_body)
+        client = Client()
+        client.force_login(self.user)
+        self.assertFalse(
+            getattr(client.get(self.url), '_shared_body', False)
+        )
+
+    def test_query_string_normalized(self):
+        """Порядок и пустые параметры не влияют на ключ кеша"""
+        self.client.get(self.url + '?page=1&b=2')
+        with self.assertNumQueries(0):
+            self.client.get(self.url + '?b=2&empty=&page=1')
+
+    def test_logged_in_user_gets_cached_shell(self):
+        """Вошедший пользователь получает общую оболочку со своими
+        фрагментами"""
+        self.client.get(self.url)
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(self.url)
+        self.assertNotIn('page_obj', response.context)
+        self.assertContains(response, 'Пользователь: author')
+        self.assertNotContains(response, '<!--hole:')
+        self.assertNotContains(self.client.get(self.url), 'Пользователь:')
+
+    def test_post_detail_fragments(self):
+        """Кнопка правки и форма комментария видны только тем, кому
+        положено"""
+        url = reverse('posts:post_detail', args=(self.post.pk,))
+        edit_url = reverse('posts:post_edit', args=(self.post.pk,))
+        author = Client()
+        author.force_login(self.user)
+        reader = Client()
+        reader.force_login(User.objects.create_user(username='reader'))
+
+        self.assertNotContains(self.client.get(url), 'csrfmiddlewaretoken')
+        response = reader.get(url)
+        self.assertContains(response, 'csrfmiddlewaretoken')
+        self.assertNotContains(response, edit_url)
+        response = author.get(url)
+        self.assertNotIn('post_info', response.context)
+        self.assertContains(response, edit_url)
+
+    def test_follow_button_per_user(self):
+        """Кнопка подписки на закешированном профиле своя у каждого"""
+        url = reverse('posts:profile', args=(self.user.username,))
+        follow_url = reverse('posts:profile_follow', args=('author',))
+        unfollow_url = reverse('posts:profile_unfollow', args=('author',))
+        reader = User.objects.create_user(username='reader')
+        fan = User.objects.create_user(username='fan')
+        Follow.objects.create(user=fan, author=self.user)
+        clients = {}
+        for user in (reader, fan):
+            clients[user] = Client()
+            clients[user].force_login(user)
+
+        self.assertNotContains(self.client.get(url), follow_url)
+        self.assertContains(clients[reader].get(url), follow_url)
+        response = clients[fan].get(url)
+        self.assertNotIn('page_obj', response.context)
+        self.assertContains(response, unfollow_url)
+
+    def test_signals_invalidate(self):
+        """Новый пост, комментарий или подписка сбрасывают кеш страниц"""
+        other = User.objects.create_user(username='reader')
+        changes = (
+            lambda: Post.objects.create(
+                author=self.user, group=self.group, text='Новый пост'
+            ),
+            lambda: Comment.objects.create(
+                author=other, post=self.post, text='Комментарий'
+            ),
+            lambda: Follow.objects.create(user=other, author=self.user),
+        )
+        for change in changes:
+            with self.subTest(change=change):
+                self.client.get(self.url)
+                change()
+                self.assertIsNotNone(self.client.get(self.url).context)
+
+    def test_other_views_not_cached(self):
+        """Страницы вне PAGE_CACHE_VIEWS не кешируются"""
+        url = reverse('users:login')
+        self.client.get(url)
+        self.assertIsNotNone(self.client.get(url).context)
@@ -0,0 +1,32 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from posts.models import Post
+from posts.tests import factories
+from ..paginator import CachedCountPaginator
+
+
+@override_settings(PAGINATOR_EXACT_COUNT=3, ESTIMATED_COUNT_THRESHOLD=1000)
+class CachedCountPaginatorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = factories.create_user()
+
+    def test_small_result_counted_exactly(self):
+        """Небольшая выборка всегда считается точно"""
+        factories.create_posts(2, self.author)
+        self.assertEqual(CachedCountPaginator(Post.objects.all(), 2).count, 2)
+        factories.create_post(self.author)
+        self.assertEqual(CachedCountPaginator(Post.objects.all(), 2).count, 3)
+
+    def test_large_result_count_cached(self):
+        """Число записей большой выборки берётся из кеша"""
+        factories.create_posts(4, self.author)
+        queryset = Post.objects.filter(author=self.author)
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 4)
+        factories.create_post(self.author)
+        paginator = CachedCountPaginator(queryset.order_by('-pk'), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 4)
+        cache.clear()
+        self.assertEqual(CachedCountPaginator(queryset, 2).count, 5)
@@ -0,0 +1,31 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from .. import preload
+from ..management.commands.memory_report import memory_usage
+
+
+class PreloadTests(SimpleTestCase):
+    def test_warm_up(self):
+        """Прогрев загружает URLconf, шаблоны, модели и переводы"""
+        summary = preload.warm_up()
+        self.assertGreater(summary['urls'], 0)
+        self.assertGreater(summary['templates'], 0)
+        self.assertGreater(summary['models'], 0)
+        self.assertEqual(summary['language'], 'ru-ru')
+
+    def test_freeze(self):
+        """Перед fork объекты убираются из-под сборщика мусора"""
+        with mock.patch.object(preload.gc, 'freeze') as freeze:
+            preload.freeze()
+        freeze.assert_called_once_with()
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'нужен /proc')
+    def test_memory_usage(self):
+        """Общая и своя память в сумме дают RSS"""
+        usage = memory_usage(os.getpid())
+        self.assertEqual(usage['shared'] + usage['private'], usage['rss'])
@@ -0,0 +1,70 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import User
+from ..prerender import build_request
+
+PRERENDER_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(SERVE_PRERENDERED=True, PRERENDER_ROOT=PRERENDER_ROOT)
+class PrerenderedPagesTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(PRERENDER_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(PRERENDER_ROOT, ignore_errors=True)
+        self.url = reverse('about:author')
+
+    def test_without_files_view_used(self):
+        """Пока страницы не собраны, работает обычный view"""
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, 'about/author.html')
+
+    def test_guest_gets_file(self):
+        """Гость получает готовый файл с долгим кешированием"""
+        call_command('prerender_pages', stdout=StringIO())
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context)
+        self.assertIn('max-age=86400', response['Cache-Control'])
+        self.assertEqual(response['X-Frame-Options'], 'SAMEORIGIN')
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Привет! Я автор', content)
+        self.assertIn(reverse('users:login'), content)
+        self.assertNotIn('<!--hole:', content)
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_logged_in_user_gets_own_header(self):
+        """Вошедшему пользователю подставляется его шапка"""
+        call_command('prerender_pages', stdout=StringIO())
+        client = Client()
+        client.force_login(User.objects.create_user(username='reader'))
+        response = client.get(self.url)
+        self.assertTemplateNotUsed(response, 'about/author.html')
+        self.assertContains(response, 'Пользователь: reader')
+        self.assertContains(response, 'Привет! Я автор')
+
+    @override_settings(
+        PRERENDER_BASE_URL='https://example.com',
+        ALLOWED_HOSTS=['example.com'],
+    )
+    def test_request_uses_site_host(self):
+        """Страница рендерится запросом к настоящему хосту сайта"""
+        request = build_request('/about/author/')
+        self.assertEqual(
+            request.build_absolute_uri(),
+            'https://example.com/about/author/',
+        )
+        self.assertEqual(request.path, '/about/author/')
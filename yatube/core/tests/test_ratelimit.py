@@ -0,0 +1,98 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Post
+from .. import ratelimit
+from ..checks import check_shared_cache
+
+User = get_user_model()
+
+
+@override_settings(RATELIMITS={
+    'posts:add_comment': (2, 60),
+    'posts:post_create': (1, 60),
+})
+class RateLimitTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='writer')
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:add_comment', args=(self.post.pk,))
+
+    def test_comments_limited(self):
+        """Лишний комментарий получает 429 и не сохраняется"""
+        for _ in range(2):
+            self.client.post(self.url, {'text': 'Комментарий'})
+        response = self.client.post(self.url, {'text': 'Комментарий'})
+        self.assertEqual(response.status_code, 429)
+        self.assertTemplateUsed(response, 'core/429.html')
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(Comment.objects.count(), 2)
+
+    def test_limit_per_user(self):
+        """У другого пользователя свой счётчик"""
+        for _ in range(3):
+            self.client.post(self.url, {'text': 'Комментарий'})
+        other = Client()
+        other.force_login(User.objects.create_user(username='other'))
+        response = other.post(self.url, {'text': 'Комментарий'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_get_not_limited(self):
+        """GET не учитывается в лимите"""
+        url = reverse('posts:post_create')
+        for _ in range(3):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_window_resets(self):
+        """В следующем окне счётчик начинается заново"""
+        url = reverse('posts:post_create')
+        self.client.post(url, {'text': 'Пост'})
+        self.assertEqual(self.client.post(url, {'text': 'Пост'}).status_code,
+                         429)
+        now = ratelimit.time.time()
+        with mock.patch.object(ratelimit.time, 'time', return_value=now + 61):
+            response = self.client.post(url, {'text': 'Пост'})
+        self.assertEqual(response.status_code, 302)
+
+    @override_settings(WRITE_SHED_LATENCY=0.5, WRITE_SHED_RETRY_AFTER=5)
+    def test_load_shedding(self):
+        """При высокой задержке записи запросы получают 503"""
+        ratelimit.record_write_latency(10)
+        response = self.client.post(self.url, {'text': 'Комментарий'})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '5')
+        self.assertFalse(Comment.objects.exists())
+
+    @override_settings(WRITE_SHED_LATENCY=0.5, WRITE_SHED_RETRY_AFTER=5)
+    def test_single_probe_after_quiet_period(self):
+        """После паузы без замеров проходит только один пробный запрос"""
+        ratelimit.record_write_latency(10)
+        later = ratelimit.time.time() + 6
+        with mock.patch.object(ratelimit.time, 'time', return_value=later):
+            self.assertFalse(ratelimit.write_overloaded())
+            self.assertTrue(ratelimit.write_overloaded())
+        ratelimit.record_write_latency(0)
+        ratelimit.record_write_latency(0)
+        self.assertTrue(ratelimit.write_overloaded())
+        cache.set(ratelimit.LATENCY_KEY, (0.1, 0), None)
+        self.assertFalse(ratelimit.write_overloaded())
+
+    def test_shared_cache_check(self):
+        """Без общего кеша в продакшене выдаётся предупреждение"""
+        with override_settings(DEBUG=False):
+            self.assertEqual(
+                [error.id for error in check_shared_cache(None)],
+                ['core.W001'],
+            )
+        with override_settings(DEBUG=True):
+            self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, TestCase, override_settings
+
+from ..storage import CompressedManifestStaticFilesStorage
+from ..views import IMMUTABLE_CACHE_CONTROL, serve_static
+
+TEMP_STATIC_ROOT = tempfile.mkdtemp()
+TEST_CSS = b'body { color: red; }\n' * 100
+
+
+@override_settings(STATIC_ROOT=TEMP_STATIC_ROOT)
+class StaticPipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        source_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(source_dir, 'css'))
+        with open(os.path.join(source_dir, 'css', 'site.css'), 'wb') as f:
+            f.write(TEST_CSS)
+        source = FileSystemStorage(location=source_dir)
+        storage = CompressedManifestStaticFilesStorage(
+            location=TEMP_STATIC_ROOT
+        )
+        with source.open('css/site.css') as f:
+            storage.save('css/site.css', f)
+        cls.processed = list(storage.post_process(
+            {'css/site.css': (source, 'css/site.css')}
+        ))
+        shutil.rmtree(source_dir, ignore_errors=True)
+        cls.hashed_name = storage.stored_name('css/site.css')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_STATIC_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_collect_writes_hashed_and_compressed_files(self):
+        """collectstatic создаёт файл с хешем и его сжатую копию"""
+        self.assertNotEqual(self.hashed_name, 'css/site.css')
+        path = os.path.join(TEMP_STATIC_ROOT, self.hashed_name)
+        self.assertTrue(os.path.isfile(path))
+        self.assertTrue(os.path.isfile(path + '.gz'))
+
+    def test_serve_picks_gzip_by_accept_encoding(self):
+        """Сжатая копия отдаётся с кешированием навсегда"""
+        request = self.factory.get(
+            '/static/' + self.hashed_name, HTTP_ACCEPT_ENCODING='gzip'
+        )
+        response = serve_static(request, self.hashed_name)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_serve_without_accept_encoding(self):
+        """Без Accept-Encoding отдаётся исходный файл"""
+        request = self.factory.get('/static/' + self.hashed_name)
+        response = serve_static(request, self.hashed_name)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), TEST_CSS)
+
+    def test_unhashed_name_is_not_immutable(self):
+        """Файл без хеша в имени не кешируется навсегда"""
+        request = self.factory.get('/static/css/site.css')
+        response = serve_static(request, 'css/site.css')
+        self.assertFalse(response.has_header('Cache-Control'))
+        self.assertFalse(staticfiles_storage.is_hashed('css/site.css'))
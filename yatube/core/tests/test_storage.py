@@ -0,0 +1,63 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase
+
+from ..models import StoredFile
+from ..storage import (ContentAddressedStorage, InMemoryStorage,
+                       is_content_hashed)
+
+
+class InMemoryStorageTests(SimpleTestCase):
+    def test_save_open_delete(self):
+        """Файл сохраняется, читается и удаляется без диска"""
+        storage = InMemoryStorage()
+        name = storage.save('posts/a.gif', ContentFile(b'GIF89a'))
+        self.assertTrue(storage.exists(name))
+        self.assertEqual(storage.size(name), 6)
+        with storage.open(name) as file:
+            self.assertEqual(file.read(), b'GIF89a')
+        self.assertEqual(storage.listdir(''), (['posts'], []))
+        self.assertEqual(storage.url(name), '/media/posts/a.gif')
+        # Занятое имя не перезаписывается.
+        self.assertNotEqual(
+            storage.save('posts/a.gif', ContentFile(b'x')), name
+        )
+        storage.delete(name)
+        self.assertFalse(storage.exists(name))
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def test_same_content_stored_once(self):
+        """Одинаковое содержимое получает одно имя и хранится один раз"""
+        first = self.storage.save('posts/a.GIF', ContentFile(b'GIF89a'))
+        second = self.storage.save('posts/b.gif', ContentFile(b'GIF89a'))
+        other = self.storage.save('posts/a.gif', ContentFile(b'other'))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertTrue(first.startswith('posts/'))
+        self.assertTrue(first.endswith('.gif'))
+        self.assertTrue(is_content_hashed(first))
+        self.assertEqual(StoredFile.objects.get(name=first).refcount, 2)
+        self.assertEqual(len(self.storage.listdir('posts')[0]), 2)
+
+    def test_file_deleted_with_last_reference(self):
+        """Файл удаляется с диска только вместе с последней ссылкой"""
+        name = self.storage.save('posts/a.gif', ContentFile(b'GIF89a'))
+        self.storage.save('posts/b.gif', ContentFile(b'GIF89a'))
+        self.storage.delete(name)
+        self.assertTrue(self.storage.exists(name))
+        self.storage.delete(name)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(StoredFile.objects.exists())
+
+    def test_plain_names_are_not_hashed(self):
+        """Обычные имена загрузок не считаются неизменяемыми"""
+        self.assertFalse(is_content_hashed('posts/a.jpg'))
+        self.assertFalse(is_content_hashed('posts/ab/cd.jpg'))
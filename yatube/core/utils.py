@@ -0,0 +1,26 @@
+def _key_value(row, key):
+    if isinstance(row, dict):
+        return row[key]
+    if isinstance(row, tuple):
+        return row[0]
+    return getattr(row, key)
+
+
+def iterate_by_key(queryset, key='pk', chunk_size=2000):
+    """Обходит queryset порциями по возрастанию key без OFFSET.
+
+    Каждая порция — отдельный запрос WHERE key > последний ключ, поэтому
+    глубокие порции стоят столько же, сколько первая. Для values_list
+    ключ должен быть первым полем.
+    """
+    queryset = queryset.order_by(key)
+    last = None
+    while True:
+        chunk = queryset
+        if last is not None:
+            chunk = chunk.filter(**{f'{key}__gt': last})
+        rows = list(chunk[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last = _key_value(rows[-1], key)
@@ -1,4 +1,21 @@
+import mimetypes
+import os
+import posixpath
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.encoding import escape_uri_path
+
+from .compression import SUFFIXES, negotiate
+from .responses import file_response
+from .storage import is_content_hashed
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
 
 
 def page_not_found(request, exception):
@@ -15,3 +32,65 @@ def csrf_failure(request, reason=''):
 
 def server_error(request):
     return render(request, 'core/500.html', status=500)
+
+
+def _existing_file(root, path):
+    name = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = safe_join(root, name)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(fullpath):
+        raise Http404
+    return name, fullpath
+
+
+def _content_type(name):
+    return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+def serve_static(request, path):
+    """Отдаёт собранную статику, выбирая сжатую копию по Accept-Encoding."""
+    name, fullpath = _existing_file(settings.STATIC_ROOT, path)
+    available = [
+        encoding for encoding in SUFFIXES
+        if os.path.isfile(fullpath + SUFFIXES[encoding])
+    ]
+    encoding = negotiate(
+        request.META.get('HTTP_ACCEPT_ENCODING', ''), available
+    )
+    served = fullpath + SUFFIXES[encoding] if encoding else fullpath
+
+    response = file_response(request, served, _content_type(name))
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if staticfiles_storage.is_hashed(name):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+def serve_media(request, path):
+    """Отдаёт загруженные файлы.
+
+    Если перед приложением стоит nginx или Apache, передачу файла
+    забирает прокси (X-Accel-Redirect / X-Sendfile), иначе файл
+    отдаётся с поддержкой Range и условных запросов. Файлы с хешем
+    содержимого в имени кешируются клиентами навсегда.
+    """
+    name, fullpath = _existing_file(settings.MEDIA_ROOT, path)
+    content_type = _content_type(name)
+
+    if settings.MEDIA_OFFLOAD == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = escape_uri_path(
+            settings.MEDIA_ACCEL_PREFIX + name
+        )
+    elif settings.MEDIA_OFFLOAD == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = fullpath
+    else:
+        response = file_response(request, fullpath, content_type)
+    if is_content_hashed(name):
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
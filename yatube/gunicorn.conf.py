@@ -0,0 +1,20 @@
+import multiprocessing
+import os
+
+wsgi_app = 'yatube.wsgi:application'
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(
+    os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+)
+# Приложение загружается в мастере, воркеры получают его через fork.
+preload_app = True
+
+
+def when_ready(server):
+    from core import preload
+
+    summary = preload.warm_up()
+    frozen = preload.freeze()
+    server.log.info(
+        'Прогрев: %s, заморожено объектов: %d', summary, frozen
+    )
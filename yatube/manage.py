@@ -4,7 +4,13 @@ import sys
 
 
 def main():
+    if sys.argv[1:2] == ['test']:
+        os.environ.setdefault(
+            'DJANGO_SETTINGS_MODULE', 'yatube.settings_test'
+        )
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    # Пакет проекта настраивает окружение до импорта Django.
+    import yatube  # noqa: F401
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -1,5 +1,46 @@
 from django.contrib import admin
-from .models import Post, Comment
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.forms.models import BaseModelFormSet
+
+from core.paginator import EstimatedCountPaginator
+from .models import Comment, Deletion, Group, Post
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """Автодополнение, которое не запрашивает уже загруженный объект.
+
+    Обычный виджет делает запрос за подписью выбранного значения
+    в каждой строке списка; здесь подпись передаёт форма.
+    """
+    preloaded = None
+
+    def optgroups(self, name, value, attr=None):
+        selected = {
+            str(v) for v in value
+            if str(v) not in self.choices.field.empty_values
+        }
+        preloaded = self.preloaded or {}
+        if not selected.issubset(preloaded):
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required and not self.allow_multiple_selected:
+            options.append(self.create_option(name, '', '', False, 0))
+        for pk in selected:
+            options.append(self.create_option(
+                name, pk, preloaded[pk], True, len(options)
+            ))
+        return [(None, options, 0)]
+
+
+class PostChangelistFormSet(BaseModelFormSet):
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        group = form.instance.group
+        if group is not None:
+            widget = form.fields['group'].widget
+            widget = getattr(widget, 'widget', widget)
+            widget.preloaded = {str(group.pk): str(group)}
+        return form
 
 
 @admin.register(Post)
@@ -7,11 +48,52 @@ class PostAdmin(admin.ModelAdmin):
     DISPLAY_SCREEN = '-пусто-'
     list_editable = ('group',)
     list_display = ('pk', 'text', 'pub_date', 'author', 'group',)
+    list_select_related = ('author', 'group')
+    autocomplete_fields = ('group',)
+    raw_id_fields = ('author',)
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = DISPLAY_SCREEN
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.autocomplete_fields:
+            kwargs['widget'] = PreloadedAutocompleteSelect(
+                db_field.remote_field,
+                self.admin_site,
+                using=kwargs.get('using'),
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_formset(self, request, **kwargs):
+        kwargs.setdefault('formset', PostChangelistFormSet)
+        return super().get_changelist_formset(request, **kwargs)
+
+
+@admin.register(Group)
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'title', 'slug')
+    search_fields = ('title', 'slug')
+    prepopulated_fields = {'slug': ('title',)}
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('pk', 'post', 'author', 'text')
+    list_select_related = ('post', 'author')
+    raw_id_fields = ('post', 'author')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Deletion)
+class DeletionAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk', 'kind', 'label', 'step', 'deleted_rows', 'created', 'finished'
+    )
+    list_filter = ('kind',)
+    readonly_fields = (
+        'kind', 'object_id', 'label', 'step', 'deleted_rows', 'finished'
+    )
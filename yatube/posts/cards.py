@@ -0,0 +1,68 @@
+"""Кеш отрендеренных карточек постов, общий для всех лент.
+
+Ключ карточки — pk поста и версии поста, его автора и группы, поэтому
+правка поста, переименование автора или группы делают её устаревшей.
+Страница собирается из карточек, полученных двумя get_many: версии
+и сами карточки. Рендерятся только отсутствующие в кеше, а варианты
+их картинок находятся одним запросом к kvstore sorl.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from django.template.loader import render_to_string
+
+from core.cache import get_versions
+from .images import prefetch_variants
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+CARD_KEY = 'post_card:%s:%s:%s:%s'
+
+
+def post_namespace(pk):
+    return f'post:{pk}'
+
+
+def group_namespace(pk):
+    return f'group:{pk}'
+
+
+def user_namespace(pk):
+    return f'user:{pk}'
+
+
+def _card_key(post, versions):
+    return CARD_KEY % (
+        post.pk,
+        versions[post_namespace(post.pk)],
+        versions[user_namespace(post.author_id)],
+        versions[group_namespace(post.group_id)] if post.group_id else 0,
+    )
+
+
+def render_cards(posts):
+    """HTML-карточки постов в исходном порядке."""
+    posts = list(posts)
+    namespaces = set()
+    for post in posts:
+        namespaces.add(post_namespace(post.pk))
+        namespaces.add(user_namespace(post.author_id))
+        if post.group_id:
+            namespaces.add(group_namespace(post.group_id))
+    versions = get_versions(namespaces)
+    keys = [_card_key(post, versions) for post in posts]
+    cards = cache.get_many(keys)
+
+    missing = [post for post, key in zip(posts, keys) if key not in cards]
+    if missing:
+        prefetch_related_objects(missing, 'author', 'group')
+        prefetch_variants(missing)
+        rendered, ready = {}, {}
+        for post in missing:
+            key = _card_key(post, versions)
+            rendered[key] = render_to_string(CARD_TEMPLATE, {'post': post})
+            # Карточку с исходной картинкой вместо вариантов не кешируем.
+            if post.image_variants or not post.image:
+                ready[key] = rendered[key]
+        cache.set_many(ready, settings.POST_CARD_CACHE_TIMEOUT)
+        cards.update(rendered)
+    return [cards[key] for key in keys]
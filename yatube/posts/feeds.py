@@ -0,0 +1,145 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from core.cache import get_version
+from core.responses import etag_matches
+from .models import Group, Post, User
+
+FEED_FIELDS = (
+    'pk', 'text', 'pub_date', 'author__username', 'group__title',
+)
+
+
+class CachedFeedMixin:
+    """Хранит готовую ленту в кеше до следующего изменения постов.
+
+    Версия ключа увеличивается в posts.signals при сохранении
+    и удалении поста, она же входит в ETag.
+    """
+
+    def __call__(self, request, *args, **kwargs):
+        version = get_version('feeds')
+        etag = '"%s"' % hashlib.md5(
+            f'{version}:{request.path}'.encode()
+        ).hexdigest()
+        if etag_matches(request.META.get('HTTP_IF_NONE_MATCH', ''), etag):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+
+        key = f'feed:{version}:{request.path}'
+        cached = cache.get(key)
+        if cached is None:
+            response = super().__call__(request, *args, **kwargs)
+            cached = (response['Content-Type'], response.content)
+            cache.set(key, cached, settings.FEED_CACHE_TIMEOUT)
+        content_type, content = cached
+        response = HttpResponse(content, content_type=content_type)
+        response['ETag'] = etag
+        return response
+
+
+class PostsFeed(CachedFeedMixin, Feed):
+    """Лента последних постов сайта (RSS)."""
+    title = 'Yatube: последние обновления на сайте'
+    link = reverse_lazy('posts:index')
+    description = 'Новые записи всех авторов'
+
+    def items(self):
+        return Post.objects.visible().values(*FEED_FIELDS)[
+            :settings.FEED_ITEMS
+        ]
+
+    def item_title(self, item):
+        return Truncator(item['text']).words(10)
+
+    def item_description(self, item):
+        return item['text']
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=(item['pk'],))
+
+    def item_pubdate(self, item):
+        return item['pub_date']
+
+    def item_author_name(self, item):
+        return item['author__username']
+
+    def item_categories(self, item):
+        if item['group__title']:
+            return (item['group__title'],)
+        return ()
+
+
+class GroupPostsFeed(PostsFeed):
+    """Лента постов группы (RSS)."""
+
+    def get_object(self, request, slug):
+        return get_object_or_404(
+            Group.objects.only('pk', 'title', 'slug', 'description'),
+            slug=slug,
+        )
+
+    def items(self, group):
+        return group.posts.visible().values(*FEED_FIELDS)[
+            :settings.FEED_ITEMS
+        ]
+
+    def title(self, group):
+        return f'Yatube: записи сообщества {group.title}'
+
+    def link(self, group):
+        return reverse('posts:group_posts', args=(group.slug,))
+
+    def description(self, group):
+        return group.description
+
+
+class AuthorPostsFeed(PostsFeed):
+    """Лента постов автора (RSS)."""
+
+    def get_object(self, request, username):
+        return get_object_or_404(
+            User.objects.only('pk', 'username', 'first_name', 'last_name'),
+            username=username,
+            is_active=True,
+        )
+
+    def items(self, author):
+        return author.posts.values(*FEED_FIELDS)[:settings.FEED_ITEMS]
+
+    def title(self, author):
+        return f'Yatube: записи пользователя {author.username}'
+
+    def link(self, author):
+        return reverse('posts:profile', args=(author.username,))
+
+    def description(self, author):
+        return f'Все посты пользователя {author.get_full_name()}'
+
+
+class PostsAtomFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class GroupPostsAtomFeed(GroupPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, group):
+        return self.description(group)
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.description(author)
@@ -0,0 +1,51 @@
+"""Кеш подписок пользователя в виде отсортированного массива id авторов.
+
+Массив array('q') занимает 8 байт на подписку (множество int в Python —
+около 60), кладётся в кеш одной строкой байт и проверяется бинарным
+поиском, так что и одиночная, и пакетная проверка обходятся без запросов.
+"""
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Follow
+
+FOLLOWING_KEY = 'following:%s'
+
+
+def following_ids(user_id):
+    """Отсортированный массив id авторов, на которых подписан user_id."""
+    key = FOLLOWING_KEY % user_id
+    raw = cache.get(key)
+    ids = array('q')
+    if raw is None:
+        ids.extend(
+            Follow.objects.filter(user_id=user_id)
+            .order_by('author_id')
+            .values_list('author_id', flat=True)
+        )
+        cache.set(key, ids.tobytes(), settings.FOLLOW_GRAPH_TIMEOUT)
+    else:
+        ids.frombytes(raw)
+    return ids
+
+
+def contains(ids, author_id):
+    index = bisect_left(ids, author_id)
+    return index < len(ids) and ids[index] == author_id
+
+
+def is_following(user_id, author_id):
+    return contains(following_ids(user_id), author_id)
+
+
+def following_among(user_id, author_ids):
+    """Из author_ids оставляет тех, на кого подписан user_id."""
+    ids = following_ids(user_id)
+    return {author_id for author_id in author_ids if contains(ids, author_id)}
+
+
+def invalidate(user_id):
+    cache.delete(FOLLOWING_KEY % user_id)
@@ -0,0 +1,49 @@
+from core import holes
+from . import follow_graph
+
+
+@holes.register('posts/includes/switcher.html')
+def switcher(request):
+    return {}
+
+
+@holes.register('posts/holes/follow_button.html')
+def follow_button(request, author_id, username):
+    user = request.user
+    return {
+        'show': user.is_authenticated and user.pk != author_id,
+        'following': (
+            user.is_authenticated
+            and follow_graph.is_following(user.pk, author_id)
+        ),
+        'username': username,
+    }
+
+
+@holes.register('posts/includes/suggestions.html')
+def suggestions(request):
+    from .recommendations import suggested_authors
+
+    if not request.user.is_authenticated:
+        return {}
+    return {'suggestions': suggested_authors(request.user)}
+
+
+@holes.register('posts/holes/post_edit.html')
+def post_edit(request, post_id, author_id, archived):
+    return {
+        'post_id': post_id,
+        'show': request.user.pk == author_id and not archived,
+    }
+
+
+@holes.register('posts/holes/comment_form.html')
+def comment_form(request, post_id, archived):
+    # Формы нужны только странице поста, не импортируем их при старте.
+    from .forms import CommentForm
+
+    return {
+        'post_id': post_id,
+        'show': request.user.is_authenticated and not archived,
+        'form': CommentForm(),
+    }
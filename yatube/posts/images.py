@@ -0,0 +1,259 @@
+"""Адаптивные варианты картинок постов.
+
+Для каждой загруженной картинки заранее считаются кадры нескольких
+ширин и форматов с пропорциями 960×339. Шаблоны отдают их через
+srcset, и браузер скачивает только подходящий по размеру вариант.
+
+Ленты находят варианты всех постов страницы одним multi-get к kvstore
+sorl (prefetch_variants), а не отдельным запросом на каждую картинку.
+
+Новые картинки кодируются в фоновом потоке (schedule_variants), а не
+в запросе. Если процесс перезапустится раньше, недостающие варианты
+создаст команда regenerate_thumbnails.
+"""
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.conf import defaults as sorl_defaults
+from sorl.thumbnail.conf import settings as sorl_settings
+from sorl.thumbnail.images import ImageFile
+from sorl.thumbnail.kvstores.base import add_prefix
+from sorl.thumbnail.kvstores.cached_db_kvstore import (
+    EMPTY_VALUE, KVStore as CachedDbKVStore)
+from sorl.thumbnail.models import KVStore
+
+from core.utils import iterate_by_key
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    'WEBP': 'image/webp',
+    'JPEG': 'image/jpeg',
+    'PNG': 'image/png',
+}
+
+
+def variant_formats():
+    """Форматы из настроек, которые умеет кодировать Pillow.
+
+    Последний формат — запасной для тега img.
+    """
+    from PIL import features
+
+    return [
+        fmt for fmt in settings.POST_IMAGE_FORMATS
+        if fmt != 'WEBP' or features.check('webp')
+    ]
+
+
+def variant_size(width):
+    full_width, full_height = settings.POST_IMAGE_SIZE
+    return width, round(width * full_height / full_width)
+
+
+def _options(fmt):
+    return {'crop': 'center', 'upscale': True, 'format': fmt}
+
+
+def get_variant(image, width, fmt):
+    return get_thumbnail(
+        image, '%dx%d' % variant_size(width), **_options(fmt)
+    )
+
+
+def _thumbnail_file(image, width, fmt):
+    """Файл варианта без обращения к kvstore.
+
+    Имя считается так же, как в ThumbnailBackend.get_thumbnail
+    sorl-thumbnail 12.7.0 (версия закреплена в requirements.txt).
+    Совпадение имён проверяет test_thumbnail_file_matches_sorl.
+    """
+    options = _options(fmt)
+    for key, value in default.backend.default_options.items():
+        options.setdefault(key, value)
+    for key, attr in default.backend.extra_options:
+        value = getattr(sorl_settings, attr)
+        if value != getattr(sorl_defaults, attr):
+            options.setdefault(key, value)
+    name = default.backend._get_thumbnail_filename(
+        ImageFile(image), '%dx%d' % variant_size(width), options
+    )
+    return ImageFile(name, default.storage)
+
+
+def image_variants(image):
+    """Варианты картинки: [(формат, [(ширина, url), ...]), ...]."""
+    return [
+        (fmt, [
+            (width, get_variant(image, width, fmt).url)
+            for width in settings.POST_IMAGE_WIDTHS
+        ])
+        for fmt in variant_formats()
+    ]
+
+
+def generate_variants(image):
+    """Считает все варианты один раз, дальше они берутся из kvstore."""
+    if image:
+        image_variants(image)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # Пул создаётся в том процессе, который его использует: потоки
+    # не переживают fork веб-сервера.
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                1, thread_name_prefix='image-variants'
+            )
+        return _executor
+
+
+def _generate_in_background(name, on_done):
+    try:
+        error = _regenerate(name)
+        if error:
+            logger.error('Не удалось создать варианты картинки %s', error)
+        elif on_done is not None:
+            on_done()
+    finally:
+        connections.close_all()
+
+
+def schedule_variants(name, on_done=None):
+    """Ставит создание вариантов картинки в очередь фонового потока.
+
+    on_done вызывается в том же потоке, когда варианты готовы.
+    """
+    return _get_executor().submit(_generate_in_background, name, on_done)
+
+
+def _get_many_raw(keys):
+    """Значения kvstore по ключам: кеш, затем один запрос к базе."""
+    kvstore = default.kvstore
+    if not isinstance(kvstore, CachedDbKVStore):
+        return {key: kvstore._get_raw(key) for key in keys}
+    values = kvstore.cache.get_many(keys)
+    missing = [key for key in keys if key not in values]
+    if missing:
+        stored = dict(
+            KVStore.objects.filter(key__in=missing)
+            .values_list('key', 'value')
+        )
+        kvstore.cache.set_many(stored, sorl_settings.THUMBNAIL_CACHE_TIMEOUT)
+        values.update(stored)
+    return {
+        key: value for key, value in values.items()
+        if value and value != EMPTY_VALUE
+    }
+
+
+def prefetch_variants(posts):
+    """Кладёт варианты картинок в post.image_variants для всех постов.
+
+    Картинки здесь не кодируются: если каких-то вариантов ещё нет
+    в kvstore, в post.image_variants попадает пустой список и шаблон
+    выводит исходную картинку, пока варианты считает фоновый поток
+    или regenerate_thumbnails.
+    """
+    formats = variant_formats()
+    files = {
+        (post.pk, fmt, width): _thumbnail_file(post.image, width, fmt)
+        for post in posts if post.image
+        for fmt in formats
+        for width in settings.POST_IMAGE_WIDTHS
+    }
+    raw_keys = {key: add_prefix(file.key) for key, file in files.items()}
+    found = _get_many_raw(list(set(raw_keys.values())))
+    for post in posts:
+        if not post.image or not all(
+            raw_keys[post.pk, fmt, width] in found
+            for fmt in formats
+            for width in settings.POST_IMAGE_WIDTHS
+        ):
+            post.image_variants = []
+            continue
+        post.image_variants = [
+            (fmt, [
+                (width, files[post.pk, fmt, width].url)
+                for width in settings.POST_IMAGE_WIDTHS
+            ])
+            for fmt in formats
+        ]
+
+
+def _lower_priority(niceness):
+    """Уступает CPU веб-воркерам на той же машине."""
+    if niceness:
+        os.nice(niceness)
+
+
+def _regenerate(name):
+    """Создаёт варианты одной картинки; возвращает текст ошибки или None."""
+    try:
+        generate_variants(Post(image=name).image)
+    except Exception as error:
+        return f'{name}: {error}'
+    return None
+
+
+def regenerate_variants(model=Post, after=0, retry=(), workers=1,
+                        batch_size=100, pause=0, niceness=0, on_batch=None):
+    """Создаёт недостающие варианты картинок записей model.
+
+    Обходятся записи с pk больше after и записи из retry, упавшие
+    в прошлый раз, — по ключу порциями по batch_size. Картинки порции
+    обрабатывает пул из workers процессов. После порции вызывается
+    on_batch(последний pk, всего обработано, [(pk, ошибка), ...]) —
+    на нём держится контрольная точка. Возвращает число обработанных
+    картинок.
+    """
+    rows = iterate_by_key(
+        model.objects.filter(Q(pk__gt=after) | Q(pk__in=retry))
+        .exclude(image='').values_list('pk', 'image'),
+        chunk_size=batch_size,
+    )
+    pool = None
+    if workers > 1:
+        # Дочерние процессы открывают свои соединения с БД.
+        connections.close_all()
+        pool = multiprocessing.Pool(workers, _lower_priority, (niceness,))
+    else:
+        _lower_priority(niceness)
+    done = 0
+    try:
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            names = [image for _, image in batch]
+            results = (pool.map if pool else map)(_regenerate, names)
+            errors = [
+                (pk, error)
+                for (pk, _), error in zip(batch, results) if error
+            ]
+            done += len(batch)
+            if on_batch is not None:
+                on_batch(batch[-1][0], done, errors)
+            if pause and len(batch) == batch_size:
+                time.sleep(pause)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return done
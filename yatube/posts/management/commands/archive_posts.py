@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.services import archive_old_posts
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые посты и их комментарии в архивные таблицы'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.POST_ARCHIVE_AFTER_DAYS,
+            help='Архивировать посты старше стольких дней',
+        )
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        total = archive_old_posts(
+            before,
+            chunk_size=options['chunk_size'],
+            on_progress=lambda total: self.stdout.write(
+                f'Перенесено постов: {total}'
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Готово, в архиве +{total}'))
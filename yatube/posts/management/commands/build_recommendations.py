@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Считает рекомендации «на кого подписаться» по графу подписок '
+        'и группам. Нужны numpy и scipy: pip install numpy scipy'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-k', type=int, default=10, help='Рекомендаций на пользователя'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Сколько пользователей обрабатывать за один шаг',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from posts.recommendations import compute_recommendations
+            import numpy  # noqa: F401
+            import scipy  # noqa: F401
+        except ImportError as error:
+            raise CommandError(
+                f'{error}. Установите numpy и scipy: pip install numpy scipy'
+            )
+
+        started = time.monotonic()
+        saved = compute_recommendations(
+            k=options['k'],
+            batch_size=options['batch_size'],
+            on_progress=lambda done, total: self.stdout.write(
+                f'Обработано пользователей: {done}/{total}'
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Сохранено рекомендаций: {saved} '
+            f'за {time.monotonic() - started:.1f} с'
+        ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from posts.sitemaps import SECTIONS, build, write_index, write_shard
+
+
+class Command(BaseCommand):
+    help = 'Заранее собирает индекс и все шарды карты сайта на диске'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            required=True,
+            help='Адрес сайта без слеша в конце, например https://yatube.ru',
+        )
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        for section in SECTIONS.values():
+            for shard, _ in section.shards():
+                name = f'sitemap-{section.name}-{shard}.xml'
+                build(name, write_shard, section, shard, base_url)
+                self.stdout.write(f'{name} готов')
+        build('sitemap.xml', write_index, base_url)
+        self.stdout.write(self.style.SUCCESS('sitemap.xml готов'))
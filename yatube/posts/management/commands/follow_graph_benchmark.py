@@ -0,0 +1,63 @@
+import random
+import timeit
+import tracemalloc
+from array import array
+
+from django.core.management.base import BaseCommand
+
+from posts.follow_graph import contains
+
+
+def allocated(factory):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = factory()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return value, size
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает память и скорость проверки подписок для массива '
+        'из posts.follow_graph, множества и списка id'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[1000, 10000, 50000, 100000],
+            help='Сколько авторов в подписках пользователя',
+        )
+        parser.add_argument(
+            '--page', type=int, default=10, help='Авторов на странице'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{"подписок":>9} {"array, КБ":>10} {"в кеше, КБ":>11} '
+            f'{"set, КБ":>8} {"list, КБ":>9} {"страница, мкс":>14}'
+        )
+        for size in options['sizes']:
+            population = range(1, size * 20)
+            ids = sorted(random.sample(population, size))
+            page = random.sample(population, options['page'])
+
+            packed, array_size = allocated(lambda: array('q', ids))
+            # Новые объекты int, как при загрузке id из базы или кеша.
+            _, set_size = allocated(lambda: set(packed))
+            _, list_size = allocated(lambda: list(packed))
+            serialized = len(packed.tobytes())
+
+            runs = 1000
+            seconds = timeit.timeit(
+                lambda: [contains(packed, author) for author in page],
+                number=runs,
+            )
+            self.stdout.write(
+                f'{size:>9} {array_size / 1024:>10.1f} '
+                f'{serialized / 1024:>11.1f} {set_size / 1024:>8.1f} '
+                f'{list_size / 1024:>9.1f} {seconds / runs * 1e6:>14.1f}'
+            )
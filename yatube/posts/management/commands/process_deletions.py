@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import cache_lock, refresh_lock
+from posts.models import Deletion, Group, User
+from posts.services import (process_deletion, schedule_group_deletion,
+                            schedule_user_deletion)
+
+# Запуски по расписанию не должны обрабатывать очередь одновременно.
+LOCK_NAME = 'process_deletions'
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет данные заблокированных пользователей и групп порциями. '
+        'Запускается по расписанию; прерванное удаление продолжается.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', help='Сначала поставить в очередь пользователя'
+        )
+        parser.add_argument(
+            '--group', help='Сначала поставить в очередь группу (slug)'
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.1,
+            help='Пауза между порциями, чтобы не держать запись в SQLite',
+        )
+        parser.add_argument(
+            '--lock-timeout',
+            type=int,
+            default=10 * 60,
+            help='Через сколько секунд без прогресса снять блокировку',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options['user']:
+                schedule_user_deletion(
+                    User.objects.get(username=options['user'])
+                )
+            if options['group']:
+                schedule_group_deletion(
+                    Group.objects.get(slug=options['group'])
+                )
+        except (User.DoesNotExist, Group.DoesNotExist) as error:
+            raise CommandError(error)
+
+        self.lock_timeout = options['lock_timeout']
+        with cache_lock(LOCK_NAME, self.lock_timeout) as acquired:
+            if not acquired:
+                self.stdout.write('Удаление уже выполняется, выходим')
+                return
+            for deletion in Deletion.objects.filter(finished__isnull=True):
+                self.stdout.write(f'{deletion}: начато')
+                process_deletion(
+                    deletion,
+                    chunk_size=options['chunk_size'],
+                    pause=options['pause'],
+                    on_progress=self.report,
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(f'{deletion}: готово')
+                )
+
+    def report(self, deletion, done):
+        refresh_lock(LOCK_NAME, self.lock_timeout)
+        if done:
+            self.stdout.write(
+                f'{deletion}: {deletion.step} -{done}, '
+                f'всего удалено {deletion.deleted_rows}'
+            )
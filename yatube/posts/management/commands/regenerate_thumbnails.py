@@ -0,0 +1,126 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.images import regenerate_variants
+from posts.models import ArchivedPost, Post
+
+MODELS = (Post, ArchivedPost)
+
+
+class Command(BaseCommand):
+    help = (
+        'Заранее создаёт все варианты картинок постов и архива в пуле '
+        'процессов. Прерванный запуск продолжается с контрольной точки, '
+        'упавшие картинки повторяются при следующем запуске.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=max(1, (os.cpu_count() or 1) // 2),
+            help='Число процессов; по умолчанию половина ядер',
+        )
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.5,
+            help='Пауза между порциями, чтобы не занимать CPU целиком',
+        )
+        parser.add_argument(
+            '--nice',
+            type=int,
+            default=10,
+            help='Насколько понизить приоритет процессов (os.nice)',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=os.path.join(settings.BASE_DIR, '.regenerate_thumbnails'),
+            help='Файл с последним обработанным и упавшими pk',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Начать с начала, не читая контрольную точку',
+        )
+
+    def _read_checkpoint(self, path):
+        """{метка модели: {'after': pk, 'failed': [pk, ...]}}."""
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def _write_checkpoint(self, path, state):
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(state, file)
+        os.replace(temporary, path)
+
+    def _regenerate(self, model, state, checkpoint, options):
+        label = model._meta.label_lower
+        progress = state.setdefault(label, {'after': 0, 'failed': []})
+        # Упавшие в прошлый раз повторяются вместе с новыми записями.
+        retry = set(progress['failed'])
+        failed = set()
+        if progress['after'] or retry:
+            self.stdout.write(
+                f'{label}: продолжаем после {progress["after"]}, '
+                f'повторяем упавших: {len(retry)}'
+            )
+
+        def on_batch(last_pk, done, errors):
+            for _, error in errors:
+                self.stderr.write(error)
+            # Записи обходятся по возрастанию pk: всё до last_pk
+            # уже обработано.
+            retry.difference_update([pk for pk in retry if pk <= last_pk])
+            failed.update(pk for pk, _ in errors)
+            progress['after'] = max(progress['after'], last_pk)
+            progress['failed'] = sorted(retry | failed)
+            self._write_checkpoint(checkpoint, state)
+            self.stdout.write(
+                f'{label}: обработано картинок: {done}, '
+                f'последний pk: {last_pk}'
+            )
+
+        done = regenerate_variants(
+            model,
+            after=progress['after'],
+            retry=sorted(retry),
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+            niceness=options['nice'],
+            on_batch=on_batch,
+        )
+        # Повторённые записи, которых уже нет в базе, тоже не ждём.
+        progress['failed'] = sorted(failed)
+        return done
+
+    def handle(self, *args, **options):
+        checkpoint = options['checkpoint']
+        state = {} if options['restart'] else self._read_checkpoint(
+            checkpoint
+        )
+        total = sum(
+            self._regenerate(model, state, checkpoint, options)
+            for model in MODELS
+        )
+        failed = sum(len(progress['failed']) for progress in state.values())
+        if failed:
+            self._write_checkpoint(checkpoint, state)
+            self.stderr.write(
+                f'Не удалось обработать картинок: {failed}, они будут '
+                f'повторены при следующем запуске'
+            )
+        elif os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово, обработано картинок: {total}'
+        ))
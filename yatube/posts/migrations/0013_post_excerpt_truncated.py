@@ -0,0 +1,28 @@
+# Generated by Django 2.2.16 on 2026-10-19 21:40
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Length
+
+
+def fill_excerpt_truncated(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Post.objects.annotate(text_length=Length('text')).filter(
+        text_length__gt=settings.POST_EXCERPT_LENGTH
+    ).update(excerpt_truncated=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_truncated',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Анонс обрезан'),
+        ),
+        migrations.RunPython(fill_excerpt_truncated, migrations.RunPython.noop),
+    ]
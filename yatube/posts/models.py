@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils.text import Truncator
 from core.models import CreatedModel
 
 User = get_user_model()
@@ -15,11 +17,46 @@ class Group(models.Model):
         return self.title
 
 
+def make_excerpt(text):
+    return Truncator(text).chars(settings.POST_EXCERPT_LENGTH)
+
+
+def fill_excerpt(post):
+    post.excerpt = make_excerpt(post.text)
+    post.excerpt_truncated = len(post.text) > settings.POST_EXCERPT_LENGTH
+
+
+class PostQuerySet(models.QuerySet):
+    def visible(self):
+        """Посты без заблокированных и ожидающих удаления авторов."""
+        return self.filter(author__is_active=True)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create не вызывает save(), анонс заполняем здесь.
+        objs = list(objs)
+        for post in objs:
+            fill_excerpt(post)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class Post(models.Model):
     text = models.TextField(
         verbose_name='Текст поста',
         help_text='Введите текст поста',
     )
+    # Начало текста для лент, чтобы не загружать из базы весь текст.
+    excerpt = models.TextField(
+        verbose_name='Анонс',
+        editable=False,
+        blank=True,
+    )
+    # Сам текст может кончаться многоточием, поэтому факт обрезки
+    # хранится отдельно.
+    excerpt_truncated = models.BooleanField(
+        verbose_name='Анонс обрезан',
+        editable=False,
+        default=False,
+    )
 
     pub_date = models.DateTimeField(
         verbose_name='Дата публикации',
@@ -48,9 +85,21 @@ class Post(models.Model):
         blank=True
     )
 
+    is_archived = False
+
+    objects = PostQuerySet.as_manager()
+
     def __str__(self):
         return self.text[:15]
 
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None or 'text' in update_fields:
+            fill_excerpt(self)
+            if update_fields is not None:
+                update_fields = {*update_fields, 'excerpt',
+                                 'excerpt_truncated'}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
     class Meta:
         ordering = ['-pub_date']
         verbose_name = 'Пост'
@@ -119,3 +168,120 @@ class Comment(CreatedModel):
 
     def __str__(self):
         return self.text[:15]
+
+
+class Deletion(CreatedModel):
+    """Отложенное удаление пользователя или группы порциями."""
+    USER = 'user'
+    GROUP = 'group'
+    KIND_CHOICES = (
+        (USER, 'Пользователь'),
+        (GROUP, 'Группа'),
+    )
+
+    kind = models.CharField('Что удаляем', max_length=5, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField('ID объекта')
+    label = models.CharField('Объект', max_length=200)
+    step = models.CharField('Текущий шаг', max_length=30, blank=True)
+    deleted_rows = models.PositiveIntegerField('Удалено строк', default=0)
+    finished = models.DateTimeField('Завершено', null=True, blank=True)
+
+    class Meta:
+        ordering = ['created']
+        verbose_name = 'Удаление'
+        verbose_name_plural = 'Удаления'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'object_id'],
+                name='unique_deletion'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()} {self.label}'
+
+
+class ArchivedPost(models.Model):
+    """Старый пост, перенесённый из горячей таблицы постов.
+
+    Первичный ключ совпадает с ключом исходного поста, поэтому
+    адрес /posts/<id>/ продолжает работать.
+    """
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField(verbose_name='Текст поста')
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts',
+        verbose_name='Автор',
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts',
+        blank=True,
+        null=True,
+        verbose_name='Группа',
+    )
+    image = models.ImageField('Картинка', upload_to='posts/', blank=True)
+    archived = models.DateTimeField('Дата архивации', auto_now_add=True)
+
+    is_archived = True
+
+    class Meta:
+        ordering = ['-pub_date']
+        verbose_name = 'Архивный пост'
+        verbose_name_plural = 'Архивные посты'
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name='Пост'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments',
+        verbose_name='Автор'
+    )
+    text = models.TextField(verbose_name='Комментарий')
+    created = models.DateTimeField('Дата создания')
+
+    class Meta:
+        ordering = ['created']
+        verbose_name = 'Архивный комментарий'
+        verbose_name_plural = 'Архивные комментарии'
+
+    def __str__(self):
+        return self.text[:15]
+
+
+class FollowSuggestion(models.Model):
+    """Рекомендованные авторы, посчитанные командой build_recommendations."""
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='follow_suggestion',
+        verbose_name='Пользователь',
+    )
+    author_ids = models.TextField('ID авторов через запятую')
+    computed = models.DateTimeField('Дата расчёта', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+
+    def __str__(self):
+        return f'Рекомендации для {self.user_id}'
+
+    def get_author_ids(self):
+        return [int(pk) for pk in self.author_ids.split(',') if pk]
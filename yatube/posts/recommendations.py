@@ -0,0 +1,147 @@
+"""Рекомендации «на кого подписаться».
+
+Считаются офлайн командой build_recommendations: граф подписок
+выгружается в разреженную CSR-матрицу пользователь × автор, и для
+каждого пользователя векторно считаются авторы, на которых подписаны
+вместе с его авторами, и популярные авторы его групп. Результат
+сохраняется в FollowSuggestion и читается по первичному ключу.
+NumPy и SciPy нужны только для расчёта и импортируются внутри него.
+"""
+from array import array
+
+from django.db import transaction
+
+from core.utils import iterate_by_key
+from . import follow_graph
+from .models import Follow, FollowSuggestion, Post, User
+
+
+def suggested_authors(user, limit=5):
+    """Рекомендованные авторы, на которых пользователь ещё не подписан."""
+    suggestion = FollowSuggestion.objects.filter(user_id=user.pk).first()
+    if suggestion is None:
+        return []
+    author_ids = suggestion.get_author_ids()
+    followed = follow_graph.following_among(user.pk, author_ids)
+    author_ids = [pk for pk in author_ids if pk not in followed][:limit]
+    authors = User.objects.filter(is_active=True).in_bulk(author_ids)
+    return [authors[pk] for pk in author_ids if pk in authors]
+
+
+def _load_pairs(queryset):
+    """Выгружает пары id в два массива, не создавая объектов моделей.
+
+    queryset — values_list('pk', первый id, второй id).
+    """
+    left, right = array('q'), array('q')
+    for _, first, second in iterate_by_key(queryset, chunk_size=50000):
+        left.append(first)
+        right.append(second)
+    return left, right
+
+
+def _row(matrix, row):
+    start, stop = matrix.indptr[row], matrix.indptr[row + 1]
+    return matrix.indices[start:stop], matrix.data[start:stop]
+
+
+def _top(indices, values, exclude, k):
+    """Индексы k лучших ненулевых оценок строки без exclude."""
+    import numpy as np
+
+    keep = ~np.isin(indices, exclude) & (values > 0)
+    indices, values = indices[keep], values[keep]
+    if len(values) > k:
+        # Полная сортировка длинной строки дорога: отсекаем всё ниже
+        # k-й оценки, сохраняя равные ей.
+        threshold = np.partition(values, len(values) - k)[len(values) - k]
+        best = values >= threshold
+        indices, values = indices[best], values[best]
+    # При равных оценках выигрывает меньший id — результат воспроизводим.
+    order = np.lexsort((indices, -values))[:k]
+    return indices[order]
+
+
+def compute_recommendations(k=10, batch_size=10000, on_progress=None):
+    """Считает и сохраняет top-k рекомендаций для всех пользователей."""
+    import numpy as np
+    from scipy import sparse
+
+    users, authors = _load_pairs(
+        Follow.objects.values_list('pk', 'user_id', 'author_id')
+    )
+    posters, groups = _load_pairs(
+        Post.objects.filter(group__isnull=False)
+        .values_list('pk', 'author_id', 'group_id')
+    )
+    users = np.frombuffer(users, dtype=np.int64)
+    authors = np.frombuffer(authors, dtype=np.int64)
+    posters = np.frombuffer(posters, dtype=np.int64)
+    groups = np.frombuffer(groups, dtype=np.int64)
+
+    # Плотные индексы вместо id, чтобы матрицы были компактными.
+    ids = np.unique(np.concatenate((users, authors, posters)))
+    group_ids = np.unique(groups)
+    n, g = len(ids), len(group_ids)
+    if n == 0:
+        return 0
+    user_index = np.searchsorted(ids, users)
+    author_index = np.searchsorted(ids, authors)
+    poster_index = np.searchsorted(ids, posters)
+    group_index = np.searchsorted(group_ids, groups)
+
+    follows = sparse.csr_matrix(
+        (np.ones(len(users), dtype=np.float32), (user_index, author_index)),
+        shape=(n, n),
+    )
+    # Автор × автор: сколько пользователей подписаны на обоих.
+    co_follows = (follows.T @ follows).tocsr()
+    co_follows.setdiag(0)
+    co_follows.eliminate_zeros()
+
+    followers = np.asarray(follows.sum(axis=0)).ravel()
+    membership = sparse.csr_matrix(
+        (np.ones(len(posters), dtype=np.float32),
+         (poster_index, group_index)),
+        shape=(n, g),
+    )
+    membership.data[:] = 1
+    # Группа × автор с весом по числу подписчиков автора.
+    group_authors = membership.T.tocsr()
+    group_authors.data = followers[group_authors.indices].astype(np.float32)
+
+    saved = 0
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        batch = follows[start:stop]
+        co_scores = (batch @ co_follows).tocsr()
+        group_scores = (membership[start:stop] @ group_authors).tocsr()
+
+        suggestions = []
+        for row in range(stop - start):
+            index = start + row
+            followed, _ = _row(batch, row)
+            exclude = np.append(followed, index)
+            best = _top(*_row(co_scores, row), exclude, k)
+            if len(best) < k:
+                more = _top(
+                    *_row(group_scores, row),
+                    np.concatenate((exclude, best)),
+                    k - len(best),
+                )
+                best = np.concatenate((best, more))
+            if len(best):
+                suggestions.append(FollowSuggestion(
+                    user_id=int(ids[index]),
+                    author_ids=','.join(str(pk) for pk in ids[best]),
+                ))
+
+        with transaction.atomic():
+            FollowSuggestion.objects.filter(
+                user_id__gte=int(ids[start]), user_id__lte=int(ids[stop - 1])
+            ).delete()
+            FollowSuggestion.objects.bulk_create(suggestions)
+        saved += len(suggestions)
+        if on_progress is not None:
+            on_progress(stop, n)
+    return saved
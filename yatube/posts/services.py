@@ -0,0 +1,162 @@
+import time
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import (ArchivedComment, ArchivedPost, Comment, Deletion,
+                     Follow, Group, Post, User)
+
+
+def schedule_user_deletion(user):
+    """Сразу скрывает аккаунт и его посты, данные удаляет process_deletion.
+
+    Пользователь сохраняется через модель, чтобы сигналы сбросили кеш
+    страниц, лент и карточек.
+    """
+    with transaction.atomic():
+        user.is_active = False
+        user.save(update_fields=('is_active',))
+        deletion, _ = Deletion.objects.get_or_create(
+            kind=Deletion.USER,
+            object_id=user.pk,
+            defaults={'label': user.username},
+        )
+    return deletion
+
+
+def schedule_group_deletion(group):
+    deletion, _ = Deletion.objects.get_or_create(
+        kind=Deletion.GROUP,
+        object_id=group.pk,
+        defaults={'label': group.slug},
+    )
+    return deletion
+
+
+def _chunk_pks(queryset, chunk_size):
+    return list(queryset.order_by('pk').values_list('pk', flat=True)[
+        :chunk_size
+    ])
+
+
+def _delete_chunk(queryset, chunk_size):
+    pks = _chunk_pks(queryset, chunk_size)
+    if pks:
+        queryset.model.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+def _ungroup_posts(model, group_id, chunk_size):
+    pks = _chunk_pks(model.objects.filter(group_id=group_id), chunk_size)
+    return model.objects.filter(pk__in=pks).update(group=None)
+
+
+USER_STEPS = (
+    ('follows', lambda pk, size: _delete_chunk(
+        Follow.objects.filter(Q(user_id=pk) | Q(author_id=pk)), size
+    )),
+    ('comments', lambda pk, size: _delete_chunk(
+        Comment.objects.filter(author_id=pk), size
+    )),
+    ('post_comments', lambda pk, size: _delete_chunk(
+        Comment.objects.filter(post__author_id=pk), size
+    )),
+    # Картинки удалённых постов освобождает posts.signals.
+    ('posts', lambda pk, size: _delete_chunk(
+        Post.objects.filter(author_id=pk), size
+    )),
+    ('archived_comments', lambda pk, size: _delete_chunk(
+        ArchivedComment.objects.filter(
+            Q(author_id=pk) | Q(post__author_id=pk)
+        ),
+        size,
+    )),
+    ('archived_posts', lambda pk, size: _delete_chunk(
+        ArchivedPost.objects.filter(author_id=pk), size
+    )),
+    ('user', lambda pk, size: _delete_chunk(
+        User.objects.filter(pk=pk), size
+    )),
+)
+
+GROUP_STEPS = (
+    ('posts', lambda pk, size: _ungroup_posts(Post, pk, size)),
+    ('archived_posts', lambda pk, size: _ungroup_posts(
+        ArchivedPost, pk, size
+    )),
+    ('group', lambda pk, size: _delete_chunk(
+        Group.objects.filter(pk=pk), size
+    )),
+)
+
+
+def process_deletion(deletion, chunk_size=1000, pause=0, on_progress=None):
+    """Удаляет связанные строки порциями, каждая в своей транзакции.
+
+    Прогресс сохраняется после каждой порции, поэтому прерванное
+    удаление продолжается с того же места при следующем запуске.
+    """
+    steps = USER_STEPS if deletion.kind == Deletion.USER else GROUP_STEPS
+    for name, step in steps:
+        while True:
+            with transaction.atomic():
+                done = step(deletion.object_id, chunk_size)
+                deletion.step = name
+                deletion.deleted_rows += done
+                deletion.save(update_fields=('step', 'deleted_rows'))
+            if on_progress is not None:
+                on_progress(deletion, done)
+            if done < chunk_size:
+                break
+            if pause:
+                time.sleep(pause)
+    deletion.finished = timezone.now()
+    deletion.save(update_fields=('finished',))
+    return deletion
+
+
+def archive_old_posts(before, chunk_size=500, on_progress=None):
+    """Переносит посты старше before вместе с комментариями в архив.
+
+    Каждая порция копируется и удаляется из горячих таблиц в одной
+    транзакции. Возвращает число перенесённых постов.
+    """
+    total = 0
+    while True:
+        with transaction.atomic():
+            posts = list(
+                Post.objects.filter(pub_date__lt=before)
+                .order_by('pk')[:chunk_size]
+            )
+            if not posts:
+                break
+            pks = [post.pk for post in posts]
+            ArchivedPost.objects.bulk_create(
+                ArchivedPost(
+                    id=post.pk,
+                    text=post.text,
+                    pub_date=post.pub_date,
+                    author_id=post.author_id,
+                    group_id=post.group_id,
+                    image=post.image.name,
+                )
+                for post in posts
+            )
+            ArchivedComment.objects.bulk_create(
+                ArchivedComment(
+                    id=comment.pk,
+                    post_id=comment.post_id,
+                    author_id=comment.author_id,
+                    text=comment.text,
+                    created=comment.created,
+                )
+                for comment in Comment.objects.filter(post_id__in=pks)
+            )
+            Post.objects.filter(pk__in=pks).delete()
+        total += len(posts)
+        if on_progress is not None:
+            on_progress(total)
+        if len(posts) < chunk_size:
+            break
+    return total
@@ -0,0 +1,118 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.cache import bump_version
+from . import follow_graph
+from .cards import group_namespace, post_namespace, user_namespace
+from .images import schedule_variants
+from .models import ArchivedPost, Comment, Follow, Group, Post, User
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_save, sender=User)
+def invalidate_feeds(sender, update_fields=None, **kwargs):
+    # Вход пользователя обновляет только last_login — ленты не меняются.
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_version('feeds')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+@receiver(post_save, sender=Group)
+@receiver(post_save, sender=User)
+def invalidate_pages(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_version('pages')
+
+
+@receiver(post_save, sender=Post)
+def invalidate_post_card(sender, instance, created, **kwargs):
+    if not created:
+        bump_version(post_namespace(instance.pk))
+
+
+@receiver(pre_save, sender=Post)
+def remember_old_image(sender, instance, update_fields=None, **kwargs):
+    """Запоминает картинку из базы, чтобы узнать, сменилась ли она."""
+    if update_fields is not None and 'image' not in update_fields:
+        instance._old_image = instance.image.name
+    elif instance.pk is None:
+        instance._old_image = ''
+    else:
+        instance._old_image = Post.objects.filter(pk=instance.pk).values_list(
+            'image', flat=True
+        ).first() or ''
+
+
+@receiver(post_save, sender=Post)
+def generate_image_variants(sender, instance, **kwargs):
+    name = instance.image.name
+    if not name or name == instance._old_image:
+        return
+    transaction.on_commit(
+        lambda: schedule_variants(name, on_done=_variants_ready)
+    )
+
+
+def _variants_ready():
+    # Закешированные страницы показывали исходную картинку.
+    bump_version('pages')
+
+
+def _release_image(image, name):
+    # Ссылку на файл отпускаем, только если изменение зафиксировано.
+    storage = image.storage
+    transaction.on_commit(lambda: storage.delete(name))
+
+
+@receiver(post_save, sender=Post)
+def release_replaced_image(sender, instance, **kwargs):
+    if instance._old_image and instance._old_image != instance.image.name:
+        _release_image(instance.image, instance._old_image)
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    if not instance.image:
+        return
+    # archive_old_posts переносит ссылку на файл в ArchivedPost.
+    if ArchivedPost.objects.filter(pk=instance.pk).exists():
+        return
+    _release_image(instance.image, instance.image.name)
+
+
+@receiver(post_delete, sender=ArchivedPost)
+def release_archived_post_image(sender, instance, **kwargs):
+    if instance.image:
+        _release_image(instance.image, instance.image.name)
+
+
+@receiver(post_save, sender=Group)
+def invalidate_group_cards(sender, instance, created, **kwargs):
+    if not created:
+        bump_version(group_namespace(instance.pk))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_cards(sender, instance, created, update_fields=None,
+                          **kwargs):
+    if created:
+        return
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_version(user_namespace(instance.pk))
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_following(sender, instance, **kwargs):
+    follow_graph.invalidate(instance.user_id)
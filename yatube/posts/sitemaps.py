@@ -0,0 +1,205 @@
+import os
+import tempfile
+import time
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import ExpressionWrapper, F, IntegerField, Max
+from django.http import Http404
+from django.urls import reverse
+
+from core.responses import file_response
+from core.utils import iterate_by_key
+from .models import ArchivedPost, Post
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+# Ключи в базе — 64-битные целые, границы шардов не должны их превышать.
+MAX_KEY = 2 ** 63 - 1
+
+
+class SitemapSection:
+    """Раздел карты сайта, разбитый на шарды по диапазонам ключа.
+
+    Данные берутся из таблицы постов (posts()): lastmod страницы — дата её
+    последнего поста, а шард N содержит ключи
+    [N * SITEMAP_SHARD_SIZE, (N + 1) * SITEMAP_SHARD_SIZE).
+    """
+    key = None
+    url_name = None
+
+    def __init__(self, name):
+        self.name = name
+
+    @property
+    def shard_size(self):
+        return settings.SITEMAP_SHARD_SIZE
+
+    def posts(self):
+        return Post.objects.visible().order_by()
+
+    def shards(self):
+        """Номера непустых шардов и их lastmod одним GROUP BY."""
+        shard = ExpressionWrapper(
+            F(self.key) / self.shard_size, output_field=IntegerField()
+        )
+        return (
+            self.posts()
+            .filter(**{f'{self.key}__isnull': False})
+            .annotate(shard=shard)
+            .values('shard')
+            .annotate(lastmod=Max('pub_date'))
+            .values_list('shard', 'lastmod')
+            .order_by('shard')
+        )
+
+    def has_shard(self, shard):
+        return (shard + 1) * self.shard_size <= MAX_KEY
+
+    def shard_rows(self, shard):
+        start = shard * self.shard_size
+        return self.posts().filter(**{
+            f'{self.key}__gte': start,
+            f'{self.key}__lt': start + self.shard_size,
+        })
+
+    def entries(self, shard):
+        """Пары (адрес, lastmod) шарда в порядке возрастания ключа."""
+        raise NotImplementedError
+
+
+class PostSection(SitemapSection):
+    key = 'pk'
+
+    def entries(self, shard):
+        rows = self.shard_rows(shard).values_list('pk', 'pub_date')
+        for pk, pub_date in iterate_by_key(rows):
+            yield reverse('posts:post_detail', args=(pk,)), pub_date
+
+
+class ArchivedPostSection(PostSection):
+    """Архивные посты: post_detail по-прежнему их показывает."""
+
+    def posts(self):
+        return ArchivedPost.objects.filter(author__is_active=True).order_by()
+
+
+class GroupedSection(SitemapSection):
+    """Страницы, которые собирают посты по внешнему ключу."""
+    slug_field = None
+
+    def entries(self, shard):
+        rows = (
+            self.shard_rows(shard)
+            .values(self.key, self.slug_field)
+            .annotate(lastmod=Max('pub_date'))
+        )
+        for row in iterate_by_key(rows, key=self.key):
+            yield (
+                reverse(self.url_name, args=(row[self.slug_field],)),
+                row['lastmod'],
+            )
+
+
+class GroupSection(GroupedSection):
+    key = 'group_id'
+    slug_field = 'group__slug'
+    url_name = 'posts:group_posts'
+
+
+class UserSection(GroupedSection):
+    key = 'author_id'
+    slug_field = 'author__username'
+    url_name = 'posts:profile'
+
+
+SECTIONS = {
+    section.name: section
+    for section in (
+        PostSection('posts'),
+        ArchivedPostSection('archive'),
+        GroupSection('groups'),
+        UserSection('users'),
+    )
+}
+
+
+def _lastmod(value):
+    return value.date().isoformat()
+
+
+def write_index(file, base_url):
+    file.write(XML_HEADER)
+    file.write(f'<sitemapindex xmlns="{XMLNS}">\n')
+    for section in SECTIONS.values():
+        for shard, lastmod in section.shards():
+            location = base_url + reverse(
+                'sitemap_section', args=(section.name, shard)
+            )
+            file.write(
+                f'<sitemap><loc>{escape(location)}</loc>'
+                f'<lastmod>{_lastmod(lastmod)}</lastmod></sitemap>\n'
+            )
+    file.write('</sitemapindex>\n')
+
+
+def write_shard(file, section, shard, base_url):
+    file.write(XML_HEADER)
+    file.write(f'<urlset xmlns="{XMLNS}">\n')
+    for path, lastmod in section.entries(shard):
+        file.write(
+            f'<url><loc>{escape(base_url + path)}</loc>'
+            f'<lastmod>{_lastmod(lastmod)}</lastmod></url>\n'
+        )
+    file.write('</urlset>\n')
+
+
+def sitemap_path(name):
+    return os.path.join(settings.SITEMAP_ROOT, name)
+
+
+def is_fresh(path):
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return False
+    return age < settings.SITEMAP_CACHE_TIMEOUT
+
+
+def build(name, writer, *args):
+    """Пишет файл карты во временный файл и атомарно подменяет старый."""
+    os.makedirs(settings.SITEMAP_ROOT, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=settings.SITEMAP_ROOT, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            writer(file, *args)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, sitemap_path(name))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return sitemap_path(name)
+
+
+def _base_url(request):
+    return f'{request.scheme}://{request.get_host()}'
+
+
+def sitemap_index(request):
+    path = sitemap_path('sitemap.xml')
+    if not is_fresh(path):
+        path = build('sitemap.xml', write_index, _base_url(request))
+    return file_response(request, path, 'application/xml')
+
+
+def sitemap_section(request, section, shard):
+    section = SECTIONS.get(section)
+    if section is None or not section.has_shard(shard):
+        raise Http404
+    name = f'sitemap-{section.name}-{shard}.xml'
+    path = sitemap_path(name)
+    if not is_fresh(path):
+        if not section.shard_rows(shard).exists():
+            raise Http404
+        path = build(name, write_shard, section, shard, _base_url(request))
+    return file_response(request, path, 'application/xml')
@@ -0,0 +1,40 @@
+from django import template
+from django.conf import settings
+
+from ..images import CONTENT_TYPES, prefetch_variants, variant_size
+
+register = template.Library()
+
+
+def _srcset(urls):
+    return ', '.join('%s %dw' % (url, width) for width, url in urls)
+
+
+@register.inclusion_tag('posts/includes/post_image.html')
+def post_image(post, sizes='(max-width: 960px) 100vw, 960px'):
+    """Картинка поста с srcset по всем вариантам и ленивой загрузкой.
+
+    Варианты, найденные заранее prefetch_variants, берутся из поста.
+    Пока вариантов нет, выводится исходная картинка.
+    """
+    image = post.image
+    if not image:
+        return {'image': None}
+    if getattr(post, 'image_variants', None) is None:
+        prefetch_variants([post])
+    if not post.image_variants:
+        return {'image': image, 'src': image.url, 'sources': []}
+    _, fallback = post.image_variants[-1]
+    width, height = variant_size(max(settings.POST_IMAGE_WIDTHS))
+    return {
+        'image': image,
+        'sources': [
+            {'type': CONTENT_TYPES[fmt], 'srcset': _srcset(urls)}
+            for fmt, urls in post.image_variants[:-1]
+        ],
+        'src': fallback[-1][1],
+        'srcset': _srcset(fallback),
+        'sizes': sizes,
+        'width': width,
+        'height': height,
+    }
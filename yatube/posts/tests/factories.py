@@ -0,0 +1,66 @@
+"""Данные для тестов: общие для posts/tests и tests/fixtures."""
+import itertools
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+
+from ..models import Follow, Group, Post, User
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+_numbers = itertools.count(1)
+
+
+def image(name=None, content=SMALL_GIF):
+    # Хранилище в тестах общее на процесс: одинаковые имена дали бы
+    # разные суффиксы в зависимости от порядка тестов.
+    if name is None:
+        name = f'small{next(_numbers)}.gif'
+    return SimpleUploadedFile(
+        name=name, content=content, content_type='image/gif'
+    )
+
+
+def create_user(username=None, **fields):
+    if username is None:
+        username = f'user{next(_numbers)}'
+    return User.objects.create_user(username=username, **fields)
+
+
+def create_group(slug=None, **fields):
+    number = next(_numbers)
+    fields.setdefault('title', f'Тестовая группа {number}')
+    fields.setdefault('description', 'Тестовое описание')
+    return Group.objects.create(slug=slug or f'group-{number}', **fields)
+
+
+def create_post(author=None, **fields):
+    fields.setdefault('text', 'Тестовый пост')
+    return Post.objects.create(author=author or create_user(), **fields)
+
+
+def create_posts(count, author, text='Тестовый пост №{}', **fields):
+    """count постов с разными датами: каждый следующий новее.
+
+    Даты выставляются явно, чтобы не ждать между созданием постов.
+    """
+    now = timezone.now()
+    posts = []
+    for number in range(1, count + 1):
+        post = create_post(author, text=text.format(number), **fields)
+        post.pub_date = now - timedelta(seconds=count - number + 1)
+        Post.objects.filter(pk=post.pk).update(pub_date=post.pub_date)
+        posts.append(post)
+    return posts
+
+
+def create_follow(user, author):
+    return Follow.objects.create(user=user, author=author)
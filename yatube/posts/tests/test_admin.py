@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.paginator import EstimatedCountPaginator
+from ..models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class PostsAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+
+    def add_rows(self, count):
+        start = User.objects.count()
+        for i in range(start, start + count):
+            author = User.objects.create_user(username=f'author_{i}')
+            post = Post.objects.create(
+                author=author, group=self.group, text=f'Тестовый пост {i}'
+            )
+            Comment.objects.create(post=post, author=author, text='Тест')
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.admin_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов списка постов и комментариев не зависит от строк"""
+        for model in ('post', 'comment'):
+            url = reverse(f'admin:posts_{model}_changelist')
+            with self.subTest(model=model):
+                self.add_rows(2)
+                few = self.changelist_queries(url)
+                self.add_rows(5)
+                many = self.changelist_queries(url)
+                self.assertEqual(few, many)
+
+    def test_group_choices_not_rendered_per_row(self):
+        """Редактируемая группа не выводит список всех групп в каждой строке"""
+        for i in range(5):
+            Group.objects.create(title=f'Другая группа {i}', slug=f'g-{i}')
+        self.add_rows(3)
+        response = self.admin_client.get(
+            reverse('admin:posts_post_changelist')
+        )
+        self.assertNotContains(response, 'Другая группа')
+
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=3)
+    def test_estimated_count(self):
+        """Для большой таблицы без фильтров используется оценка"""
+        self.add_rows(4)
+        Post.objects.order_by('pk').first().delete()
+        paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+        self.assertEqual(paginator.count, Post.objects.latest('pk').pk)
+        filtered = EstimatedCountPaginator(
+            Post.objects.filter(group=self.group), 10
+        )
+        self.assertEqual(filtered.count, 3)
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import ArchivedComment, ArchivedPost, Comment, Post
+from ..services import archive_old_posts
+
+User = get_user_model()
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.old_post = Post.objects.create(author=cls.user, text='Старый')
+        Post.objects.filter(pk=cls.old_post.pk).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        cls.comment = Comment.objects.create(
+            post=cls.old_post, author=cls.user, text='Старый комментарий'
+        )
+        cls.new_post = Post.objects.create(author=cls.user, text='Новый')
+
+    def setUp(self):
+        self.auth_client = Client()
+        self.auth_client.force_login(self.user)
+
+    def archive(self):
+        return archive_old_posts(timezone.now() - timedelta(days=365))
+
+    def test_old_posts_moved_to_archive(self):
+        """Старые посты с комментариями уходят из горячих таблиц"""
+        self.assertEqual(self.archive(), 1)
+        self.assertEqual(list(Post.objects.all()), [self.new_post])
+        self.assertFalse(Comment.objects.exists())
+        archived = ArchivedPost.objects.get(pk=self.old_post.pk)
+        self.assertEqual(archived.text, self.old_post.text)
+        self.assertEqual(
+            ArchivedComment.objects.get(pk=self.comment.pk).post, archived
+        )
+
+    def test_archived_post_detail(self):
+        """Архивный пост открывается по прежнему адресу без формы"""
+        self.archive()
+        response = self.auth_client.get(
+            reverse('posts:post_detail', args=(self.old_post.pk,))
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.old_post.text)
+        self.assertContains(response, self.comment.text)
+        self.assertNotContains(
+            response,
+            reverse('posts:add_comment', args=(self.old_post.pk,)),
+        )
+
+    def test_missing_post_detail(self):
+        """Несуществующий пост по-прежнему возвращает 404"""
+        response = self.auth_client.get(
+            reverse('posts:post_detail', args=(10 ** 6,))
+        )
+        self.assertEqual(response.status_code, 404)
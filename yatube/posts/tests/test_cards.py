@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..cards import render_cards
+from ..models import Group, Post, User
+
+
+class PostCardsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='Описание'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, group=cls.group, text=f'Пост {i}')
+            for i in range(5)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def posts(self):
+        return list(Post.objects.order_by('pk'))
+
+    def test_cached_cards_not_rendered(self):
+        """Закешированные карточки не требуют запросов к базе"""
+        cards = render_cards(self.posts())
+        self.assertEqual(len(cards), 5)
+        self.assertIn('Пост 0', cards[0])
+        posts = self.posts()
+        with self.assertNumQueries(0):
+            self.assertEqual(render_cards(posts), cards)
+
+    def test_evicted_version_not_reset(self):
+        """Вытесненная версия не возвращает старую карточку"""
+        post = self.posts()[0]
+        render_cards([post])
+        post.text = 'Исправленный пост'
+        post.save()
+        self.assertIn('Исправленный пост', render_cards(self.posts()[:1])[0])
+        cache.delete(f'version:post:{post.pk}')
+        self.assertIn('Исправленный пост', render_cards(self.posts()[:1])[0])
+
+    def test_only_missing_rendered(self):
+        """Рендерятся только отсутствующие карточки"""
+        posts = self.posts()
+        render_cards(posts[:2])
+        posts = self.posts()
+        # Автор и группа подгружаются одним запросом каждый.
+        with self.assertNumQueries(2):
+            cards = render_cards(posts)
+        self.assertIn('Пост 4', cards[4])
+
+    def test_post_edit_invalidates_card(self):
+        """Правка поста обновляет его карточку"""
+        render_cards(self.posts())
+        post = self.posts()[0]
+        post.text = 'Новый текст'
+        post.save()
+        self.assertIn('Новый текст', render_cards(self.posts())[0])
+
+    def test_group_and_author_rename_invalidate_cards(self):
+        """Переименование группы или автора обновляет карточки"""
+        render_cards(self.posts())
+        self.group.slug = 'new-slug'
+        self.group.save()
+        self.assertIn('/group/new-slug/', render_cards(self.posts())[0])
+        self.user.username = 'renamed'
+        self.user.save()
+        self.assertIn('renamed', render_cards(self.posts())[0])
@@ -0,0 +1,49 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from . import factories
+from ..models import Post
+
+
+@override_settings(POST_EXCERPT_LENGTH=20)
+class PostExcerptTests(TestCase):
+    def setUp(self):
+        self.author = factories.create_user()
+        self.long_text = 'Очень длинный пост ' * 50
+
+    def test_excerpt_updated_on_save(self):
+        """Анонс пересчитывается при сохранении текста"""
+        post = factories.create_post(self.author, text='Короткий')
+        self.assertEqual(post.excerpt, 'Короткий')
+        self.assertFalse(post.excerpt_truncated)
+        post.text = self.long_text
+        post.save(update_fields=('text',))
+        post.refresh_from_db()
+        self.assertEqual(len(post.excerpt), 20)
+        self.assertTrue(post.excerpt_truncated)
+
+    def test_text_with_ellipsis_not_truncated(self):
+        """Короткий текст с многоточием в конце не считается обрезанным"""
+        post = factories.create_post(self.author, text='Продолжение следует…')
+        self.assertEqual(post.excerpt, post.text)
+        self.assertFalse(post.excerpt_truncated)
+
+    def test_bulk_create_sets_excerpt(self):
+        """bulk_create тоже заполняет анонс"""
+        Post.objects.bulk_create([Post(author=self.author, text='Пост')])
+        self.assertEqual(Post.objects.get().excerpt, 'Пост')
+        Post.objects.bulk_create(
+            [Post(author=self.author, text=self.long_text)]
+        )
+        self.assertTrue(Post.objects.get(text=self.long_text)
+                        .excerpt_truncated)
+
+    def test_feed_shows_excerpt_without_text(self):
+        """Лента выводит анонс со ссылкой и не загружает текст"""
+        post = factories.create_post(self.author, text=self.long_text)
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, post.excerpt)
+        self.assertNotContains(response, self.long_text)
+        self.assertContains(response, 'Читать далее')
+        self.assertIn('text', response.context['page_obj'][0]
+                      .get_deferred_fields())
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class PostsFeedsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            group=cls.group,
+            text='Тестовый пост в группе',
+        )
+        cls.other_post = Post.objects.create(
+            author=User.objects.create_user(username='other_user'),
+            text='Пост другого автора',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_feeds_contain_expected_posts(self):
+        """Ленты сайта, группы и автора содержат свои посты"""
+        feeds = {
+            reverse('posts:feed_rss'): (True, True),
+            reverse('posts:feed_atom'): (True, True),
+            reverse('posts:group_feed_rss', args=(self.group.slug,)): (
+                True, False
+            ),
+            reverse('posts:group_feed_atom', args=(self.group.slug,)): (
+                True, False
+            ),
+            reverse('posts:profile_feed_rss', args=(self.user.username,)): (
+                True, False
+            ),
+            reverse(
+                'posts:profile_feed_atom', args=(self.user.username,)
+            ): (True, False),
+        }
+        for url, (has_post, has_other) in feeds.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, 200)
+                content = response.content.decode()
+                self.assertEqual(self.post.text in content, has_post)
+                self.assertEqual(self.other_post.text in content, has_other)
+
+    def test_unknown_group_feed(self):
+        """Лента несуществующей группы возвращает 404"""
+        response = self.guest_client.get(
+            reverse('posts:group_feed_rss', args=('no-such-group',))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_feed_etag(self):
+        """Повторный запрос с If-None-Match получает 304"""
+        url = reverse('posts:feed_atom')
+        etag = self.guest_client.get(url)['ETag']
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_feed_weak_etag(self):
+        """ETag сжатой ленты с W/ тоже даёт 304"""
+        url = reverse('posts:feed_rss')
+        etag = self.guest_client.get(
+            url, HTTP_ACCEPT_ENCODING='gzip'
+        )['ETag']
+        response = self.guest_client.get(
+            url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+        response = self.guest_client.get(
+            url, HTTP_IF_NONE_MATCH=etag.replace('W/', '')
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_feed_invalidated_on_post_save_and_delete(self):
+        """Новый и удалённый пост сразу отражаются в ленте"""
+        url = reverse('posts:feed_rss')
+        etag = self.guest_client.get(url)['ETag']
+        post = Post.objects.create(author=self.user, text='Свежий пост')
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(post.text, response.content.decode())
+
+        post.delete()
+        response = self.guest_client.get(url)
+        self.assertNotIn(post.text, response.content.decode())
@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import follow_graph
+from ..models import Follow
+
+User = get_user_model()
+
+
+class FollowGraphTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.authors = [
+            User.objects.create_user(username=f'author_{i}') for i in range(5)
+        ]
+        for author in cls.authors[:3]:
+            Follow.objects.create(user=cls.user, author=author)
+
+    def setUp(self):
+        cache.clear()
+        self.auth_client = Client()
+        self.auth_client.force_login(self.user)
+
+    def test_batch_membership_in_one_lookup(self):
+        """Проверка целой страницы авторов не делает запросов к базе"""
+        follow_graph.following_ids(self.user.pk)
+        author_ids = [author.pk for author in self.authors]
+        with self.assertNumQueries(0):
+            following = follow_graph.following_among(self.user.pk, author_ids)
+        self.assertEqual(following, set(author_ids[:3]))
+
+    def test_follow_and_unfollow_invalidate(self):
+        """Подписка и отписка сразу меняют закешированный список"""
+        author = self.authors[4]
+        self.assertFalse(follow_graph.is_following(self.user.pk, author.pk))
+        self.auth_client.get(
+            reverse('posts:profile_follow', args=(author.username,))
+        )
+        self.assertTrue(follow_graph.is_following(self.user.pk, author.pk))
+        self.auth_client.get(
+            reverse('posts:profile_unfollow', args=(author.username,))
+        )
+        self.assertFalse(follow_graph.is_following(self.user.pk, author.pk))
+
+    def test_profile_uses_follow_graph(self):
+        """Профиль показывает верную кнопку подписки"""
+        response = self.auth_client.get(
+            reverse('posts:profile', args=(self.authors[0].username,))
+        )
+        self.assertContains(response, 'Отписаться')
+        response = self.auth_client.get(
+            reverse('posts:profile', args=(self.authors[4].username,))
+        )
+        self.assertContains(response, 'Подписаться')
+        self.assertNotContains(response, 'Отписаться')
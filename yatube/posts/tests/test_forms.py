@@ -4,6 +4,7 @@ from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from posts.forms import PostForm
 
+from . import factories
 from ..models import Group, Post, Comment
 
 User = get_user_model()
@@ -27,21 +28,6 @@ class PostsFormsTests(TestCase):
         cls.file_field = SimpleUploadedFile("best_test_file.txt",
                                             b"file_content")
 
-        small_gif = (
-            b'\x47\x49\x46\x38\x39\x61\x02\x00'
-            b'\x01\x00\x80\x00\x00\x00\x00\x00'
-            b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
-            b'\x00\x00\x00\x2C\x00\x00\x00\x00'
-            b'\x02\x00\x01\x00\x00\x02\x02\x0C'
-            b'\x0A\x00\x3B'
-        )
-
-        cls.uploaded = SimpleUploadedFile(
-            name='small.gif',
-            content=small_gif,
-            content_type='image/gif'
-        )
-
         cls.post = Post.objects.create(
             author=cls.user,
             group=cls.group,
@@ -61,7 +47,7 @@ class PostsFormsTests(TestCase):
         form_data = {
             'text': TEST_POST_TEXT,
             'group': self.group.pk,
-            'image': self.uploaded,
+            'image': factories.image(),
         }
 
         response = self.auth_client.post(
@@ -76,14 +62,14 @@ class PostsFormsTests(TestCase):
         )
         # Тестовая запись с валидной картинкой создалась
         self.assertEqual(Post.objects.count(), posts_count + 1)
-        self.assertTrue(
-            Post.objects.filter(
-                text=TEST_POST_TEXT,
-                group=self.group,
-                author=self.user,
-                image='posts/small.gif',
-            ).exists()
+        post = Post.objects.exclude(image='').get(
+            text=TEST_POST_TEXT,
+            group=self.group,
+            author=self.user,
         )
+        self.assertTrue(post.image.name.startswith('posts/'))
+        with post.image.open() as stored:
+            self.assertEqual(stored.read(), factories.SMALL_GIF)
 
     def test_not_valid_image(self):
         posts_count = Post.objects.count()
@@ -0,0 +1,73 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import StoredFile
+from . import factories
+from ..models import ArchivedPost, Post
+from ..services import archive_old_posts
+
+
+class ImageFileTests(TestCase):
+    def setUp(self):
+        self.author = factories.create_user()
+        for target, kwargs in (
+            ('posts.signals.transaction.on_commit',
+             {'side_effect': lambda func: func()}),
+            ('posts.signals.schedule_variants', {}),
+        ):
+            patcher = mock.patch(target, **kwargs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def create_post(self, content, **fields):
+        return factories.create_post(
+            self.author,
+            image=factories.image(content=factories.SMALL_GIF + content),
+            **fields,
+        )
+
+    def assertReleased(self, name):
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+        self.assertFalse(Post.image.field.storage.exists(name))
+
+    def test_replaced_and_deleted_images_released(self):
+        """Заменённая и удалённая картинки отпускают ссылку на файл"""
+        post = self.create_post(b'first')
+        other = self.create_post(b'first')
+        first = post.image.name
+        self.assertEqual(other.image.name, first)
+        self.assertEqual(StoredFile.objects.get(name=first).refcount, 2)
+
+        post.image = factories.image(
+            content=factories.SMALL_GIF + b'second'
+        )
+        post.save()
+        second = post.image.name
+        self.assertEqual(StoredFile.objects.get(name=first).refcount, 1)
+        self.assertTrue(Post.image.field.storage.exists(first))
+
+        post.text = 'Другой текст'
+        post.save()
+        self.assertEqual(StoredFile.objects.get(name=second).refcount, 1)
+
+        other.delete()
+        self.assertReleased(first)
+        post.delete()
+        self.assertReleased(second)
+
+    def test_archived_post_keeps_image(self):
+        """Перенос в архив не отпускает файл, удаление из архива — да"""
+        post = self.create_post(b'archived')
+        name = post.image.name
+        Post.objects.filter(pk=post.pk).update(
+            pub_date=timezone.now() - timedelta(days=400)
+        )
+        archive_old_posts(timezone.now() - timedelta(days=365))
+        self.assertEqual(StoredFile.objects.get(name=name).refcount, 1)
+        self.assertTrue(Post.image.field.storage.exists(name))
+
+        ArchivedPost.objects.get(pk=post.pk).delete()
+        self.assertReleased(name)
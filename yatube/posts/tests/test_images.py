@@ -0,0 +1,218 @@
+import json
+import os
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from . import factories
+from ..images import (_thumbnail_file, generate_variants, get_variant,
+                      image_variants, prefetch_variants, schedule_variants,
+                      variant_formats, variant_size)
+from ..models import ArchivedPost, Post
+
+
+@override_settings(
+    POST_IMAGE_WIDTHS=(320, 960), POST_IMAGE_FORMATS=('WEBP', 'JPEG')
+)
+class PostImageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = factories.create_user()
+
+    def test_webp_only_when_supported(self):
+        """WEBP выдаётся, только если его умеет кодировать Pillow"""
+        with mock.patch('PIL.features.check', return_value=False):
+            self.assertEqual(variant_formats(), ['JPEG'])
+        with mock.patch('PIL.features.check', return_value=True):
+            self.assertEqual(variant_formats(), ['WEBP', 'JPEG'])
+
+    def test_variant_keeps_proportions(self):
+        """Варианты сохраняют пропорции кадра 960×339"""
+        self.assertEqual(variant_size(960), (960, 339))
+        self.assertEqual(variant_size(320), (320, 113))
+
+    def test_variants_generated_on_upload(self):
+        """Варианты ставятся в очередь только при смене картинки"""
+        with mock.patch('posts.signals.transaction.on_commit',
+                        side_effect=lambda func: func()), \
+                mock.patch('posts.signals.schedule_variants') as schedule:
+            post = factories.create_post(
+                self.author, image=factories.image()
+            )
+            schedule.assert_called_once()
+            self.assertEqual(schedule.call_args.args, (post.image.name,))
+            post = Post.objects.get(pk=post.pk)
+            post.text = 'Другой текст'
+            post.save()
+            post.save(update_fields=('text',))
+            schedule.assert_called_once()
+            post.image = factories.image(
+                content=factories.SMALL_GIF + b'other'
+            )
+            post.save()
+            self.assertEqual(schedule.call_count, 2)
+            self.assertEqual(schedule.call_args.args, (post.image.name,))
+
+    def test_variants_generated_in_background(self):
+        """Варианты кодируются вне потока запроса"""
+        post = factories.create_post(self.author, image=factories.image())
+        threads = []
+        on_done = mock.Mock()
+        with mock.patch(
+            'posts.images.generate_variants',
+            side_effect=lambda image: threads.append(
+                threading.current_thread()
+            ),
+        ):
+            schedule_variants(post.image.name, on_done).result()
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+        on_done.assert_called_once_with()
+
+    def test_missing_variants_not_encoded_in_request(self):
+        """Без готовых вариантов страница отдаёт исходную картинку"""
+        post = factories.create_post(self.author, image=factories.image())
+        profile = reverse('posts:profile', args=(self.author.username,))
+        with mock.patch('posts.images.get_thumbnail') as get_thumbnail:
+            for url in (profile,
+                        reverse('posts:post_detail', args=(post.pk,))):
+                with self.subTest(url=url):
+                    response = self.client.get(url)
+                    self.assertContains(response, f'src="{post.image.url}"')
+                    self.assertNotContains(response, 'srcset=')
+        get_thumbnail.assert_not_called()
+        generate_variants(post.image)
+        self.assertContains(self.client.get(profile), 'srcset=')
+
+    @override_settings(POST_IMAGE_FORMATS=('WEBP', 'JPEG', 'PNG'))
+    def test_thumbnail_file_matches_sorl(self):
+        """Имя варианта без kvstore совпадает с именем от sorl"""
+        post = factories.create_post(self.author, image=factories.image())
+        for fmt in variant_formats():
+            for width in settings.POST_IMAGE_WIDTHS:
+                with self.subTest(fmt=fmt, width=width):
+                    self.assertEqual(
+                        _thumbnail_file(post.image, width, fmt).name,
+                        get_variant(post.image, width, fmt).name,
+                    )
+
+    def test_feed_and_detail_use_srcset(self):
+        """Лента и страница поста выводят srcset с ленивой загрузкой"""
+        post = factories.create_post(self.author, image=factories.image())
+        _, urls = image_variants(post.image)[-1]
+        self.assertEqual([width for width, _ in urls], [320, 960])
+        srcset = '%s 320w, %s 960w' % (urls[0][1], urls[1][1])
+        for url in (reverse('posts:index'),
+                    reverse('posts:post_detail', args=(post.pk,))):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, f'srcset="{srcset}"')
+                self.assertContains(response, 'loading="lazy"')
+                self.assertContains(response, 'width="960" height="339"')
+
+    def test_prefetch_variants_in_one_query(self):
+        """Варианты всей страницы находятся одним запросом к kvstore"""
+        posts = [
+            factories.create_post(self.author, image=factories.image())
+            for _ in range(3)
+        ]
+        posts.append(factories.create_post(self.author))
+        for post in posts:
+            generate_variants(post.image)
+        cache.clear()
+        with self.assertNumQueries(1):
+            prefetch_variants(posts)
+        for post in posts[:3]:
+            self.assertEqual(post.image_variants, image_variants(post.image))
+        self.assertEqual(posts[3].image_variants, [])
+        with self.assertNumQueries(0):
+            prefetch_variants(posts)
+
+
+class RegenerateThumbnailsTests(TestCase):
+    def setUp(self):
+        author = factories.create_user()
+        self.posts = [
+            factories.create_post(author, image=factories.image(
+                content=factories.SMALL_GIF + str(number).encode()
+            ))
+            for number in range(3)
+        ]
+        factories.create_post(author)
+        self.archived = ArchivedPost.objects.create(
+            id=self.posts[-1].pk + 100,
+            text='Архивный пост',
+            pub_date=self.posts[0].pub_date,
+            author=author,
+            image=factories.image(
+                content=factories.SMALL_GIF + b'archived'
+            ),
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint = os.path.join(directory.name, 'checkpoint')
+
+    def regenerate(self, failing=()):
+        def generate(image):
+            if image.name in failing:
+                raise OSError('битый файл')
+
+        with mock.patch('posts.images.generate_variants',
+                        side_effect=generate) as generate_variants:
+            call_command(
+                'regenerate_thumbnails',
+                workers=1,
+                batch_size=2,
+                pause=0,
+                nice=0,
+                checkpoint=self.checkpoint,
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+        return [
+            call.args[0].name for call in generate_variants.call_args_list
+        ]
+
+    def write_checkpoint(self, state):
+        with open(self.checkpoint, 'w') as file:
+            json.dump(state, file)
+
+    def read_checkpoint(self):
+        with open(self.checkpoint) as file:
+            return json.load(file)
+
+    def test_regenerates_all_images(self):
+        """Команда создаёт варианты картинок постов и архива"""
+        self.assertEqual(
+            self.regenerate(),
+            [post.image.name for post in self.posts]
+            + [self.archived.image.name],
+        )
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resumes_from_checkpoint(self):
+        """Прерванный запуск продолжается после сохранённого поста"""
+        self.write_checkpoint(
+            {'posts.post': {'after': self.posts[1].pk, 'failed': []}}
+        )
+        self.assertEqual(
+            self.regenerate(),
+            [self.posts[2].image.name, self.archived.image.name],
+        )
+
+    def test_failed_images_retried(self):
+        """Упавшие картинки остаются в checkpoint и повторяются"""
+        failing = self.posts[0].image.name
+        self.regenerate(failing=(failing,))
+        self.assertEqual(self.read_checkpoint()['posts.post'], {
+            'after': self.posts[-1].pk, 'failed': [self.posts[0].pk],
+        })
+        self.assertEqual(self.regenerate(), [failing])
+        self.assertFalse(os.path.exists(self.checkpoint))
@@ -0,0 +1,67 @@
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Group, Post
+from ..recommendations import compute_recommendations, suggested_authors
+
+try:
+    import numpy
+    import scipy
+except ImportError:
+    numpy = scipy = None
+
+User = get_user_model()
+
+
+@unittest.skipIf(numpy is None or scipy is None, 'нужны numpy и scipy')
+class RecommendationsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader, cls.other_reader, cls.poster = (
+            User.objects.create_user(username=name)
+            for name in ('reader', 'other_reader', 'poster')
+        )
+        cls.authors = [
+            User.objects.create_user(username=f'author_{i}') for i in range(4)
+        ]
+        first, second, third, popular = cls.authors
+        for author in (first, second):
+            Follow.objects.create(user=cls.reader, author=author)
+        for author in (first, second, third):
+            Follow.objects.create(user=cls.other_reader, author=author)
+        group = Group.objects.create(title='Группа', slug='group')
+        Post.objects.create(author=cls.poster, group=group, text='Пост')
+        Post.objects.create(author=popular, group=group, text='Пост')
+        Follow.objects.create(user=cls.other_reader, author=popular)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_co_follow_recommendations(self):
+        """Рекомендуются авторы, на которых подписаны вместе"""
+        compute_recommendations(k=1, batch_size=2)
+        self.assertEqual(suggested_authors(self.reader), [self.authors[2]])
+
+    def test_popular_in_groups(self):
+        """Без подписок рекомендуются популярные авторы своих групп"""
+        compute_recommendations(k=3)
+        self.assertEqual(suggested_authors(self.poster), [self.authors[3]])
+
+    def test_followed_authors_are_hidden(self):
+        """Автор пропадает из рекомендаций сразу после подписки"""
+        compute_recommendations(k=1)
+        Follow.objects.create(user=self.reader, author=self.authors[2])
+        self.assertEqual(suggested_authors(self.reader), [])
+
+    def test_follow_index_shows_suggestions(self):
+        """Страница подписок показывает рекомендации"""
+        compute_recommendations(k=1)
+        client = Client()
+        client.force_login(self.reader)
+        response = client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.context['suggestions'], [self.authors[2]])
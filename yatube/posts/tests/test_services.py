@@ -0,0 +1,124 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from core.cache import cache_lock, get_version
+from ..models import Comment, Deletion, Follow, Group, Post
+from ..services import (process_deletion, schedule_group_deletion,
+                        schedule_user_deletion)
+
+User = get_user_model()
+
+
+class Interrupted(Exception):
+    pass
+
+
+class DeletionServiceTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='test_user')
+        self.other = User.objects.create_user(username='other_user')
+        self.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        for i in range(5):
+            post = Post.objects.create(
+                author=self.user, group=self.group, text=f'Пост {i}'
+            )
+            Comment.objects.create(post=post, author=self.other, text='Тест')
+        other_post = Post.objects.create(author=self.other, text='Чужой')
+        Comment.objects.create(post=other_post, author=self.user, text='Я')
+        Follow.objects.create(user=self.user, author=self.other)
+        Follow.objects.create(user=self.other, author=self.user)
+
+    def test_user_is_deactivated_immediately(self):
+        """Аккаунт блокируется сразу, данные остаются до обработки"""
+        deletion = schedule_user_deletion(self.user)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertIsNone(deletion.finished)
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 5)
+
+    def test_deactivated_user_hidden_at_once(self):
+        """Посты и профиль скрываются сразу, кеш страниц сбрасывается"""
+        cache.clear()
+        version = get_version('pages')
+        schedule_user_deletion(self.user)
+        self.assertGreater(get_version('pages'), version)
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(
+            [post.author for post in response.context['page_obj']],
+            [self.other],
+        )
+        post = Post.objects.filter(author=self.user).first()
+        for url in (
+            reverse('posts:profile', args=(self.user.username,)),
+            reverse('posts:post_detail', args=(post.pk,)),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_overlapping_runs_skipped(self):
+        """Пока идёт один запуск process_deletions, второй не работает"""
+        deletion = schedule_user_deletion(self.user)
+        out = StringIO()
+        with cache_lock('process_deletions', 60) as acquired:
+            self.assertTrue(acquired)
+            call_command('process_deletions', stdout=out)
+        self.assertIn('уже выполняется', out.getvalue())
+        deletion.refresh_from_db()
+        self.assertIsNone(deletion.finished)
+        call_command('process_deletions', pause=0, stdout=StringIO())
+        deletion.refresh_from_db()
+        self.assertIsNotNone(deletion.finished)
+
+    def test_user_data_deleted_in_chunks(self):
+        """Все данные пользователя удаляются порциями"""
+        deletion = schedule_user_deletion(self.user)
+        chunks = []
+        process_deletion(
+            deletion,
+            chunk_size=2,
+            on_progress=lambda deletion, done: chunks.append(done),
+        )
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(Post.objects.get().author, self.other)
+        self.assertFalse(Comment.objects.exists())
+        self.assertLessEqual(max(chunks), 2)
+        # 2 подписки, 1 + 5 комментариев, 5 постов и сам пользователь
+        self.assertEqual(deletion.deleted_rows, 14)
+        self.assertIsNotNone(deletion.finished)
+
+    def test_interrupted_deletion_resumes(self):
+        """Прерванное удаление продолжается с того же места"""
+        deletion = schedule_user_deletion(self.user)
+
+        def interrupt(deletion, done):
+            if deletion.step == 'posts':
+                raise Interrupted
+
+        with self.assertRaises(Interrupted):
+            process_deletion(deletion, chunk_size=2, on_progress=interrupt)
+        deletion = Deletion.objects.get(pk=deletion.pk)
+        self.assertEqual(deletion.step, 'posts')
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 3)
+
+        process_deletion(deletion, chunk_size=2)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertEqual(deletion.deleted_rows, 14)
+
+    def test_group_deletion_keeps_posts(self):
+        """При удалении группы посты остаются без группы"""
+        deletion = schedule_group_deletion(self.group)
+        process_deletion(deletion, chunk_size=2)
+        self.assertFalse(Group.objects.exists())
+        self.assertEqual(
+            Post.objects.filter(author=self.user, group=None).count(), 5
+        )
@@ -0,0 +1,125 @@
+import shutil
+from datetime import timedelta
+from io import StringIO
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.utils import iterate_by_key
+from ..models import Group, Post
+from ..services import archive_old_posts
+
+User = get_user_model()
+
+TEMP_SITEMAP_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(SITEMAP_ROOT=TEMP_SITEMAP_ROOT, SITEMAP_SHARD_SIZE=2)
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.user,
+                group=cls.group,
+                text=f'Тестовый пост №{i}',
+            )
+            for i in range(5)
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_SITEMAP_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        shutil.rmtree(TEMP_SITEMAP_ROOT, ignore_errors=True)
+        self.guest_client = Client()
+
+    def test_index_lists_shards(self):
+        """Индекс перечисляет шарды всех разделов"""
+        response = self.guest_client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode()
+        shards = {post.pk // 2 for post in self.posts}
+        for shard in shards:
+            with self.subTest(shard=shard):
+                self.assertIn(f'/sitemap-posts-{shard}.xml', content)
+        self.assertIn(f'/sitemap-groups-{self.group.pk // 2}.xml', content)
+        self.assertIn(f'/sitemap-users-{self.user.pk // 2}.xml', content)
+
+    def test_shards_cover_all_pages(self):
+        """Шарды содержат все посты, группу и автора"""
+        content = ''
+        for section, keys in (
+            ('posts', [post.pk for post in self.posts]),
+            ('groups', [self.group.pk]),
+            ('users', [self.user.pk]),
+        ):
+            for shard in {key // 2 for key in keys}:
+                response = self.guest_client.get(
+                    reverse('sitemap_section', args=(section, shard))
+                )
+                self.assertEqual(response.status_code, 200)
+                content += b''.join(response.streaming_content).decode()
+        for post in self.posts:
+            self.assertIn(f'/posts/{post.pk}/</loc>', content)
+        self.assertIn(f'/group/{self.group.slug}/</loc>', content)
+        self.assertIn(f'/profile/{self.user.username}/</loc>', content)
+
+    def test_archived_posts_listed(self):
+        """Архивные посты остаются в карте сайта"""
+        post = self.posts[0]
+        archive_old_posts(timezone.now() + timedelta(days=1))
+        self.assertFalse(Post.objects.exists())
+        content = b''.join(
+            self.guest_client.get('/sitemap.xml').streaming_content
+        ).decode()
+        self.assertIn(f'/sitemap-archive-{post.pk // 2}.xml', content)
+        response = self.guest_client.get(
+            reverse('sitemap_section', args=('archive', post.pk // 2))
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            f'/posts/{post.pk}/</loc>',
+            b''.join(response.streaming_content).decode(),
+        )
+
+    def test_unknown_section_or_empty_shard(self):
+        """Несуществующий раздел, пустой или огромный шард возвращают 404"""
+        for url in (
+            '/sitemap-comments-0.xml',
+            '/sitemap-posts-1000.xml',
+            '/sitemap-posts-99999999999999999999.xml',
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.guest_client.get(url).status_code, 404)
+
+    def test_build_command(self):
+        """Команда build_sitemaps собирает файлы на диске"""
+        call_command(
+            'build_sitemaps', base_url='https://example.com', stdout=StringIO()
+        )
+        response = self.guest_client.get('/sitemap.xml')
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('https://example.com/sitemap-posts-', content)
+
+    def test_iterate_by_key(self):
+        """Обход по ключу без OFFSET возвращает все строки по порядку"""
+        rows = list(iterate_by_key(
+            Post.objects.values_list('pk', 'text'), chunk_size=2
+        ))
+        self.assertEqual(
+            [pk for pk, _ in rows], sorted(post.pk for post in self.posts)
+        )
@@ -1,12 +1,11 @@
-from time import sleep
 from yatube.settings import NUMBER_OF_POSTS
 from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
 from django.urls import reverse
 from django import forms
 from django.core.cache import cache
-from django.core.files.uploadedfile import SimpleUploadedFile
 
+from . import factories
 from ..models import Group, Post, Comment, Follow
 
 User = get_user_model()
@@ -36,33 +35,14 @@ class PostsViewsTests(TestCase):
             username='test_user_not_author'
         )
 
-        for i in range(NUMBER_OF_POSTS + TEST_POSTS_OFFSET):
-            Post.objects.create(
-                author=cls.user,
-                group=cls.group2,
-                text=f'Тестовый пост №{i+1}',
-            )
-            sleep(0.01)
-
-        test_gif = (
-            b'\x47\x49\x46\x38\x39\x61\x02\x00'
-            b'\x01\x00\x80\x00\x00\x00\x00\x00'
-            b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
-            b'\x00\x00\x00\x2C\x00\x00\x00\x00'
-            b'\x02\x00\x01\x00\x00\x02\x02\x0C'
-            b'\x0A\x00\x3B'
-        )
-
-        uploaded = SimpleUploadedFile(
-            name='test.gif',
-            content=test_gif,
-            content_type='image/gif'
+        factories.create_posts(
+            NUMBER_OF_POSTS + TEST_POSTS_OFFSET, cls.user, group=cls.group2
         )
 
         cls.post = Post.objects.create(
             author=cls.user,
             group=cls.group,
-            image=uploaded,
+            image=factories.image(),
             text=TEST_POST_TEXT,
         )
 
@@ -134,7 +114,7 @@ class PostsViewsTests(TestCase):
             post_text,
             TEST_POST_TEXT
         )
-        self.assertEqual(post_image, 'posts/test.gif')
+        self.assertEqual(post_image, self.post.image)
 
     def test_group_posts_page_show_correct_context(self):
         """Шаблон group_list сформирован с правильным контекстом"""
@@ -157,7 +137,7 @@ class PostsViewsTests(TestCase):
             post_text,
             TEST_POST_TEXT
         )
-        self.assertEqual(post_image, 'posts/test.gif')
+        self.assertEqual(post_image, self.post.image)
 
     def test_profile_page_show_correct_context(self):
         """Шаблон profile сформирован с правильным контекстом"""
@@ -180,7 +160,7 @@ class PostsViewsTests(TestCase):
             post_text,
             TEST_POST_TEXT
         )
-        self.assertEqual(post_image, 'posts/test.gif')
+        self.assertEqual(post_image, self.post.image)
 
     def test_post_detail_page_show_correct_context(self):
         """Шаблон post_detail сформирован с правильным контекстом"""
@@ -201,7 +181,7 @@ class PostsViewsTests(TestCase):
             post_text,
             TEST_POST_TEXT
         )
-        self.assertEqual(post_image, 'posts/test.gif')
+        self.assertEqual(post_image, self.post.image)
 
     def test_post_create_show_correct_context(self):
         """Шаблон create_post (create) сформирован с правильным контекстом"""
@@ -363,7 +343,8 @@ class PostsViewsTests(TestCase):
 
     def test_index_page_caching(self):
         """Проверка кеширования шаблона index"""
-
+        # Другие тесты класса могли уже закешировать фрагмент страницы.
+        cache.clear()
         post = Post.objects.create(
             author=PostsViewsTests.user,
             group=self.group,
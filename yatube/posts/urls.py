@@ -1,11 +1,33 @@
 from django.urls import path
-from . import views
+from . import feeds, views
 app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('feeds/rss/', feeds.PostsFeed(), name='feed_rss'),
+    path('feeds/atom/', feeds.PostsAtomFeed(), name='feed_atom'),
     path('group/<slug:slug>/', views.group_posts, name='group_posts'),
+    path(
+        'group/<slug:slug>/rss/',
+        feeds.GroupPostsFeed(),
+        name='group_feed_rss'
+    ),
+    path(
+        'group/<slug:slug>/atom/',
+        feeds.GroupPostsAtomFeed(),
+        name='group_feed_atom'
+    ),
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.AuthorPostsFeed(),
+        name='profile_feed_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.AuthorPostsAtomFeed(),
+        name='profile_feed_atom'
+    ),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
@@ -1,9 +1,10 @@
-from django.core.paginator import Paginator
 from django.conf import settings
 
+from core.paginator import CachedCountPaginator
+
 
 def get_paginator(queryset, request):
-    paginator = Paginator(queryset, settings.NUMBER_OF_POSTS)
+    paginator = CachedCountPaginator(queryset, settings.NUMBER_OF_POSTS)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return {
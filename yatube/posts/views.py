@@ -1,49 +1,49 @@
 from django.shortcuts import render, get_object_or_404
-from .models import Post, Group, User, Follow
-from posts.forms import PostForm
+from core.ratelimit import ratelimit
+from .models import ArchivedPost, Post, Group, User, Follow
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect
+from .recommendations import suggested_authors
 from .utils import get_paginator
 from .forms import CommentForm, PostForm
 
 
 def index(request):
-    post_context = get_paginator(Post.objects.all(), request)
+    post_context = get_paginator(
+        Post.objects.visible().defer('text'), request
+    )
     return render(request, 'posts/index.html', post_context)
 
 
 def group_posts(request, slug):
-    group = get_object_or_404(
-        Group.objects.all().prefetch_related('posts'),
-        slug=slug)
+    group = get_object_or_404(Group, slug=slug)
     context = {
         'group': group,
     }
-    context.update(get_paginator(group.posts.all(), request))
+    context.update(
+        get_paginator(group.posts.visible().defer('text'), request)
+    )
     return render(request, 'posts/group_list.html', context)
 
 
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    following = False
-
-    if request.user.is_authenticated:
-        following = Follow.objects.filter(
-            user=request.user,
-            author=author,
-        ).exists()
-
+    author = get_object_or_404(User, username=username, is_active=True)
+    # Кнопку подписки и рекомендации рендерят фрагменты follow_button
+    # и suggestions (posts/holes.py).
     context = {
         'author': author,
-        'following': following,
     }
-
-    context.update(get_paginator(author.posts.all(), request))
+    context.update(get_paginator(author.posts.defer('text'), request))
     return render(request, 'posts/profile.html', context)
 
 
 def post_detail(request, post_id):
-    post_info = get_object_or_404(Post, pk=post_id)
+    try:
+        post_info = Post.objects.visible().get(pk=post_id)
+    except Post.DoesNotExist:
+        post_info = get_object_or_404(
+            ArchivedPost, pk=post_id, author__is_active=True
+        )
     form = CommentForm()
     context = {
         'post_info': post_info,
@@ -52,6 +52,7 @@ def post_detail(request, post_id):
     return render(request, 'posts/post_detail.html', context)
 
 
+@ratelimit('posts:post_create')
 @login_required
 def post_create(request):
     form = PostForm(request.POST or None, files=request.FILES or None)
@@ -83,6 +84,7 @@ def post_edit(request, post_id):
                   {'form': form, 'is_edit': True, 'post_id': post_id, })
 
 
+@ratelimit('posts:add_comment')
 @login_required
 def add_comment(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
@@ -97,8 +99,12 @@ def add_comment(request, post_id):
 
 @login_required
 def follow_index(request):
-    fav_posts = Post.objects.filter(author__following__user=request.user)
-    context = {}
+    fav_posts = Post.objects.visible().filter(
+        author__following__user=request.user
+    ).defer('text')
+    context = {
+        'suggestions': suggested_authors(request.user),
+    }
     context.update(get_paginator(fav_posts, request))
     return render(request, 'posts/follow.html', context)
 
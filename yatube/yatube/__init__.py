@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Django 2.2 импортирует distutils, а подмена distutils из setuptools
+# тянет за собой весь setuptools и pkg_resources — это десятки
+# миллисекунд на каждом старте. До Python 3.12 берём distutils из stdlib.
+# Пакет импортируют manage.py, yatube.wsgi и yatube.asgi.
+if sys.version_info < (3, 12):
+    os.environ.setdefault('SETUPTOOLS_USE_DISTUTILS', 'stdlib')
@@ -0,0 +1,13 @@
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+from core.asgi import WsgiToAsgi
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+
+wsgi_application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+application = WsgiToAsgi(wsgi_application, settings.ASGI_THREADS)
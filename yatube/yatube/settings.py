@@ -1,21 +1,68 @@
 import os
 from dotenv import load_dotenv
-from pathlib import Path
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+# Ищет .env от каталога настроек вверх, в том числе в каталоге проекта.
 load_dotenv()
-env_path = Path('.') / '.env'
-load_dotenv(env_path)
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 DEBUG = True
 NUMBER_OF_POSTS = 10
+# Длина анонса поста в лентах, в символах
+POST_EXCERPT_LENGTH = 300
+# Сколько секунд хранить в кеше список подписок пользователя
+FOLLOW_GRAPH_TIMEOUT = 24 * 60 * 60
+# Посты старше стольких дней команда archive_posts переносит в архив
+POST_ARCHIVE_AFTER_DAYS = 365
+# Количество записей в RSS/Atom-лентах и время хранения ленты в кеше
+FEED_ITEMS = 20
+FEED_CACHE_TIMEOUT = 60 * 60
+# Время хранения отрендеренной карточки поста в кеше
+POST_CARD_CACHE_TIMEOUT = 24 * 60 * 60
+# Варианты картинок постов: ширины кадра 960×339 и форматы в порядке
+# предпочтения; последний формат — запасной, WEBP — если его умеет Pillow
+POST_IMAGE_SIZE = (960, 339)
+POST_IMAGE_WIDTHS = (320, 640, 960)
+POST_IMAGE_FORMATS = ('WEBP', 'JPEG')
+# Сколько секунд хранить в кеше общие страницы (0 — не кешировать)
+PAGE_CACHE_SECONDS = int(os.getenv('PAGE_CACHE_SECONDS', 0 if DEBUG else 60))
+PAGE_CACHE_VIEWS = (
+    'posts:index',
+    'posts:group_posts',
+    'posts:profile',
+    'posts:post_detail',
+)
+# Заранее отрендеренные командой prerender_pages статические страницы
+SERVE_PRERENDERED = os.getenv(
+    'SERVE_PRERENDERED', '0' if DEBUG else '1'
+) == '1'
+PRERENDER_VIEWS = (
+    'about:author',
+    'about:tech',
+)
+PRERENDER_ROOT = os.path.join(BASE_DIR, 'prerendered')
+PRERENDER_MAX_AGE = 24 * 60 * 60
+# Адрес сайта для запросов, которыми рендерятся эти страницы
+PRERENDER_BASE_URL = os.getenv('PRERENDER_BASE_URL', 'http://localhost')
+# Карта сайта: адресов в шарде, каталог готовых файлов и их срок жизни
+SITEMAP_SHARD_SIZE = 50000
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+SITEMAP_CACHE_TIMEOUT = 6 * 60 * 60
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Загрузки хранятся под хешем содержимого без дублей; миниатюры sorl
+# сами именуются хешем и пишутся в обычное файловое хранилище
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+THUMBNAIL_STORAGE = 'django.core.files.storage.FileSystemStorage'
+# Передача медиафайлов фронт-прокси: 'x-accel-redirect' (nginx),
+# 'x-sendfile' (Apache, lighttpd) или пусто — отдаёт само приложение
+MEDIA_OFFLOAD = os.getenv('MEDIA_OFFLOAD', '')
+# internal-location nginx, который смотрит в MEDIA_ROOT
+MEDIA_ACCEL_PREFIX = '/protected-media/'
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -24,11 +71,45 @@ ALLOWED_HOSTS = [
     'testserver',
 ]
 
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+# Лимиты запросов, блокировки команд и версии ключей должны быть общими
+# для всех процессов: в продакшене нужен memcached (python-memcached),
+# LocMemCache годится только для разработки и тестов
+if os.getenv('MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': os.getenv('MEMCACHED_LOCATION').split(','),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
     }
+
+# Ограничение записи: не больше N POST-запросов за M секунд
+# на пользователя (для гостей — на IP-адрес)
+RATELIMITS = {
+    'posts:add_comment': (10, 60),
+    'posts:post_create': (5, 60),
 }
+# Если средняя длительность записи выше порога (в секундах), запросы
+# на запись сразу получают 503 с Retry-After
+WRITE_SHED_LATENCY = 1.0
+WRITE_SHED_RETRY_AFTER = 5
+
+# С какого размера таблицы админка показывает оценку вместо COUNT(*)
+ESTIMATED_COUNT_THRESHOLD = 100000
+# Ленты считают записи точно до этого числа, а число записей больших
+# выборок берут из кеша на PAGINATOR_COUNT_TIMEOUT секунд
+PAGINATOR_EXACT_COUNT = 1000
+PAGINATOR_COUNT_TIMEOUT = 5 * 60
+
+# Ответы меньше этого размера (в байтах) не сжимаются
+COMPRESSION_MIN_SIZE = 200
+# Сколько секунд хранить сжатые тела одинаковых ответов
+COMPRESSION_CACHE_TIMEOUT = 300
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
@@ -52,6 +133,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.CompressionMiddleware',
+    'core.middleware.PrerenderedPageMiddleware',
+    'core.middleware.PageCacheMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -81,6 +165,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
+# Потоков для синхронных view в yatube.asgi.application
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', 32))
 
 
 # Database
@@ -132,3 +218,8 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+# collectstatic кладёт файлы с хешем в имени и сжатые копии .gz/.br
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# Раздача собранной статики самим приложением (без фронт-прокси)
+SERVE_STATIC = os.getenv('SERVE_STATIC') == '1'
@@ -0,0 +1,14 @@
+"""Настройки для быстрого прогона тестов.
+
+manage.py test включает их сам, pytest — через pytest.ini.
+"""
+from .settings import *  # noqa: F401,F403
+
+# PBKDF2 намеренно медленный, для тестов пароли стойкими быть не должны.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+# Загрузки и миниатюры не пишутся в MEDIA_ROOT. Загрузки хранятся
+# по хешу содержимого, как в рабочих настройках.
+DEFAULT_FILE_STORAGE = 'core.storage.InMemoryContentAddressedStorage'
+THUMBNAIL_STORAGE = 'core.storage.InMemoryStorage'